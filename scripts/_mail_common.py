@@ -0,0 +1,124 @@
+"""Shared helpers for the Mail scripts: locate, copy and open the Envelope Index.
+
+Mail keeps the Envelope Index open, so every script works on a private temp copy.
+"""
+
+import ctypes
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+MAIL_BASE = Path("~/Library/Mail").expanduser()
+
+# The copied Envelope Index is a private throwaway, so durability doesn't matter:
+# skip journaling/fsync and give the read-heavy queries a big cache + mmap.
+TMP_DB_PRAGMAS = (
+    "temp_store=MEMORY",
+    "cache_size=-65536",
+    "mmap_size=268435456",
+    "synchronous=OFF",
+    "journal_mode=OFF",
+    "locking_mode=EXCLUSIVE",
+)
+
+
+def find_envelope_index(mail_base: Path = MAIL_BASE) -> Path | None:
+    """Return the newest V*/MailData Envelope Index, or None if there isn't one."""
+    try:
+        versions = [p for p in mail_base.iterdir() if p.is_dir() and p.name.startswith("V")]
+    except OSError:
+        return None
+    versions.sort(key=lambda p: p.name, reverse=True)
+    for v in versions:
+        for name in ("Envelope Index", "Envelope Index.db"):
+            p = v / "MailData" / name
+            if p.exists():
+                return p
+
+    # Fallback: any SQLite-looking file under MailData
+    for v in versions:
+        maildata = v / "MailData"
+        for f in maildata.iterdir() if maildata.exists() else []:
+            if f.is_file() and (
+                f.suffix in (".db", ".sqlite") or "Envelope" in f.name or "envelope" in f.name
+            ):
+                return f
+    return None
+
+
+def _load_clonefile():
+    """Return libc's clonefile(2) on macOS, or None where it isn't available."""
+    if sys.platform != "darwin":
+        return None
+    try:
+        fn = ctypes.CDLL(None, use_errno=True).clonefile
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_clonefile = _load_clonefile()
+CLONE_NOFOLLOW = 0x0001
+
+
+def _clone_or_copy(src: str, dst: str) -> None:
+    """APFS copy-on-write clone (instant), falling back to a data-only copy.
+
+    clonefile() refuses to overwrite, so dst must not exist yet.
+    """
+    if _clonefile is not None:
+        if _clonefile(os.fsencode(src), os.fsencode(dst), CLONE_NOFOLLOW) == 0:
+            return
+    shutil.copyfile(src, dst)
+
+
+def copy_db_fast(idx: Path) -> str:
+    """Copy the Envelope Index (plus -wal/-shm) into a private temp dir; return the copy's path.
+
+    The copy gets a fresh directory, so no name is reused and a partial copy is
+    removed along with it.
+    """
+    tmpdir = tempfile.mkdtemp(prefix="envelope-")
+    tmp = os.path.join(tmpdir, "Envelope Index")
+    try:
+        _clone_or_copy(str(idx), tmp)
+        for suffix in ("-wal", "-shm"):
+            if Path(str(idx) + suffix).exists():
+                _clone_or_copy(str(idx) + suffix, tmp + suffix)
+    except BaseException:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+    return tmp
+
+
+def remove_tmp_db(tmp: str) -> None:
+    """Delete a copy made by copy_db_fast, with its -wal/-shm and temp dir."""
+    shutil.rmtree(os.path.dirname(tmp), ignore_errors=True)
+
+
+def open_envelope_db(idx: Path) -> tuple[sqlite3.Connection, str]:
+    """Copy idx and open the copy with read-tuned PRAGMAs and fresh planner stats.
+
+    Returns (conn, tmp_path); pass tmp_path to remove_tmp_db() when done.
+    Raises OSError if the copy fails (e.g. no Full Disk Access).
+    """
+    tmp = copy_db_fast(idx)
+    conn = None
+    try:
+        conn = sqlite3.connect(tmp)
+        for pragma in TMP_DB_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        # Bounded ANALYZE: samples each index instead of scanning it end to end
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+    except BaseException:
+        if conn is not None:
+            conn.close()
+        remove_tmp_db(tmp)
+        raise
+    return conn, tmp
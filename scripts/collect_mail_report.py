@@ -3,104 +3,242 @@
 Run with Full Disk Access (Terminal in Privacy settings).
 """
 
+import binascii
 import email
-import os
+import email.message
 import re
-import shutil
 import sqlite3
-import tempfile
 import time
+from email.parser import BytesHeaderParser
 from pathlib import Path
 
-MAIL_BASE = Path("~/Library/Mail").expanduser()
-SECONDS_PER_DAY = 86400
-
+from _mail_common import MAIL_BASE, find_envelope_index, open_envelope_db, remove_tmp_db
 
-def find_envelope_index() -> Path | None:
-    try:
-        versions = [p for p in MAIL_BASE.iterdir() if p.is_dir() and p.name.startswith("V")]
-    except OSError:
+SECONDS_PER_DAY = 86400
+SAMPLE_DB_ROWS = 5
+_WS_RE = re.compile(r"\s+")
+
+REPORT_HEADERS = (
+    "From", "To", "Cc", "Bcc", "Subject", "Date",
+    "Message-ID", "In-Reply-To", "References", "Reply-To",
+)
+_HEADER_END_RE = re.compile(rb"\r?\n\r?\n")
+_HEADER_FIELD_RE = re.compile(rb"^([!-9;-~]+):[ \t]*(.*(?:\r?\n[ \t].*)*)", re.M)
+_FOLD_RE = re.compile(rb"\r?\n[ \t]+")
+_BOUNDARY_RE = re.compile(rb'boundary="?([^";\r\n]+)"?', re.I)
+_FILENAME_RE = re.compile(rb'\bfilename="?([^";\r\n]+)"?', re.I)
+_NAME_RE = re.compile(rb'\bname="?([^";\r\n]+)"?', re.I)
+FULL_PARSE_LIMIT = 256 * 1024
+PREFIX_READ = 64 * 1024
+_HEADER_PARSER = BytesHeaderParser()
+
+
+def _locate_email(raw: bytes) -> bytes:
+    """Return the RFC822 portion of an .emlx blob (after Apple's plist), or b""."""
+    for marker in (b"\nFrom:", b"\nSubject:", b"\nContent-Type:", b"\nMessage-ID:"):
+        idx = raw.find(marker)
+        if idx >= 0 and idx < len(raw) - 50:
+            start = raw.rfind(b"\n", 0, idx) + 1 if idx > 0 else 0
+            candidate = raw[start:]
+            if not candidate.lstrip().startswith(b"<") and (
+                b"From:" in candidate or b"Content-Type:" in candidate
+            ):
+                return candidate
+    first_newline = raw.find(b"\n")
+    if first_newline > 0:
+        try:
+            plist_len = int(raw[:first_newline].decode().strip())
+            if 0 < plist_len < 100_000:
+                email_start = first_newline + 1 + plist_len
+                if email_start < len(raw):
+                    candidate = raw[email_start:]
+                    if b"From:" in candidate or b"Content-Type:" in candidate:
+                        return candidate
+        except ValueError:
+            pass
+    plist_end = raw.find(b"</plist>")
+    if plist_end >= 0:
+        after = plist_end + len(b"</plist>")
+        while after < len(raw) and raw[after : after + 1] in (b"\n", b"\r"):
+            after += 1
+        if after < len(raw):
+            candidate = raw[after:]
+            if b"From:" in candidate or b"Content-Type:" in candidate:
+                return candidate
+    return b""
+
+
+def _split_message(data: bytes) -> tuple[dict[bytes, bytes], bytes] | None:
+    """Split a message (or MIME part) into lowercased headers and raw body bytes."""
+    if data[:1] == b"\n":
+        return {}, data[1:]
+    if data[:2] == b"\r\n":
+        return {}, data[2:]
+    m = _HEADER_END_RE.search(data)
+    if not m:
         return None
-    for v in sorted(versions, key=lambda p: p.name, reverse=True):
-        for name in ("Envelope Index", "Envelope Index.db"):
-            p = v / "MailData" / name
-            if p.exists():
-                return p
-    return None
+    headers: dict[bytes, bytes] = {}
+    for hm in _HEADER_FIELD_RE.finditer(data, 0, m.start()):
+        name = hm.group(1).lower()
+        if name not in headers:
+            headers[name] = _FOLD_RE.sub(b" ", hm.group(2)).strip()
+    return headers, data[m.end() :]
 
 
-def copy_db(idx: Path) -> str:
-    fd, tmp = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    shutil.copy2(str(idx), tmp)
-    for suffix in ("-wal", "-shm"):
-        if Path(str(idx) + suffix).exists():
-            shutil.copy2(str(idx) + suffix, tmp + suffix)
-    return tmp
+def _content_type(headers: dict[bytes, bytes]) -> bytes:
+    return headers.get(b"content-type", b"text/plain").split(b";", 1)[0].strip().lower()
 
 
-def parse_emlx_full(path: Path) -> dict | None:
-    """Parse .emlx and extract all available headers and body."""
+def _iter_parts(headers: dict[bytes, bytes], body: bytes, depth: int = 0):
+    """Yield (headers, body) for a message and every nested MIME part, like msg.walk().
+
+    Raises ValueError on anything the fast path doesn't handle.
+    """
+    yield headers, body
+    if not _content_type(headers).startswith(b"multipart/"):
+        return
+    bm = _BOUNDARY_RE.search(headers.get(b"content-type", b""))
+    if not bm or depth >= 8:
+        raise ValueError("unsupported multipart")
+    chunks = body.split(b"--" + bm.group(1))
+    if len(chunks) < 2:
+        raise ValueError("boundary not found")
+    last = len(chunks) - 1
+    for i, chunk in enumerate(chunks[1:], 1):
+        if chunk.startswith(b"--"):
+            break
+        nl = chunk.find(b"\n")
+        if nl < 0:
+            continue
+        split = _split_message(chunk[nl + 1 :])
+        if split is None:
+            if i == last:
+                break  # unterminated final part, e.g. cut off by a prefix read
+            raise ValueError("malformed part")
+        yield from _iter_parts(*split, depth=depth + 1)
+
+
+def _decode_payload(headers: dict[bytes, bytes], body: bytes) -> bytes:
+    cte = headers.get(b"content-transfer-encoding", b"").lower()
     try:
-        raw = path.read_bytes()
-    except OSError:
-        return None
+        if cte == b"base64":
+            # Drop a trailing partial quantum so a cut-off payload still decodes
+            data = b"".join(body.split())
+            return binascii.a2b_base64(data[: len(data) // 4 * 4])
+        if cte == b"quoted-printable":
+            return binascii.a2b_qp(body)
+    except (binascii.Error, ValueError):
+        pass
+    return body
 
-    email_part = ""
-    for marker in (b"\nFrom:", b"\nSubject:", b"\nContent-Type:", b"\nMessage-ID:"):
-        idx = raw.find(marker)
-        if idx >= 0 and idx < len(raw) - 50:
-            start = raw.rfind(b"\n", 0, idx) + 1 if idx > 0 else 0
-            decoded = raw[start:].decode("utf-8", errors="replace")
-            if not decoded.lstrip().startswith("<") and (
-                "From:" in decoded or "Content-Type:" in decoded
-            ):
-                email_part = decoded
-                break
-    if not email_part:
-        first_newline = raw.find(b"\n")
-        if first_newline > 0:
-            try:
-                plist_len = int(raw[:first_newline].decode().strip())
-                if 0 < plist_len < 100_000:
-                    email_start = first_newline + 1 + plist_len
-                    if email_start < len(raw):
-                        candidate = raw[email_start:].decode("utf-8", errors="replace")
-                        if "From:" in candidate or "Content-Type:" in candidate:
-                            email_part = candidate
-            except ValueError:
-                pass
-    if not email_part:
-        plist_end = raw.find(b"</plist>")
-        if plist_end >= 0:
-            after = plist_end + len(b"</plist>")
-            while after < len(raw) and raw[after : after + 1] in (b"\n", b"\r"):
-                after += 1
-            if after < len(raw):
-                candidate = raw[after:].decode("utf-8", errors="replace")
-                if "From:" in candidate or "Content-Type:" in candidate:
-                    email_part = candidate
-
-    if not email_part:
-        return None
 
+def _fast_parse(email_bytes: bytes, truncated: bool = False) -> dict | None:
+    """Header/body extraction without building an email.message tree.
+
+    Only decodes the headers the report uses, the first text/plain body and
+    attachment filenames. Returns None when the message needs the full parser.
+    With truncated=True, email_bytes is a file prefix: a multipart message is
+    only accepted if its closing boundary is inside the prefix, so no part
+    (and no attachment) can be missing.
+    """
+    split = _split_message(email_bytes)
+    if split is None:
+        return None
+    headers, body = split
+    result = {
+        name: headers.get(name.lower().encode(), b"").decode("utf-8", errors="replace")
+        for name in REPORT_HEADERS
+    }
     try:
-        msg = email.message_from_string(email_part)
-    except Exception:
+        parts = list(_iter_parts(headers, body))
+    except ValueError:
         return None
+    if truncated and len(parts) > 1:
+        bm = _BOUNDARY_RE.search(headers.get(b"content-type", b""))
+        if not bm or b"--" + bm.group(1) + b"--" not in body:
+            return None  # more parts continue past the prefix
+
+    text = b""
+    if len(parts) == 1:
+        text = _decode_payload(headers, body)
+    else:
+        for part_headers, part_body in parts:
+            if _content_type(part_headers) == b"text/plain":
+                text = _decode_payload(part_headers, part_body)
+                break
+    result["body_preview"] = _WS_RE.sub(" ", text.decode("utf-8", errors="replace").strip())[:400]
+
+    attachments = []
+    for part_headers, _part_body in parts:
+        disposition = part_headers.get(b"content-disposition")
+        if not disposition:
+            continue
+        if b"*=" in disposition:
+            return None  # RFC 2231 encoded filename
+        fm = _FILENAME_RE.search(disposition) or _NAME_RE.search(
+            part_headers.get(b"content-type", b"")
+        )
+        attachments.append({
+            "filename": fm.group(1).decode("utf-8", errors="replace") if fm else None,
+            "content_type": _content_type(part_headers).decode("ascii", errors="replace"),
+        })
+    result["attachments"] = attachments
+    return result
 
-    result = {
-        "From": msg.get("From", ""),
-        "To": msg.get("To", ""),
-        "Cc": msg.get("Cc", ""),
-        "Bcc": msg.get("Bcc", ""),
-        "Subject": msg.get("Subject", ""),
-        "Date": msg.get("Date", ""),
-        "Message-ID": msg.get("Message-ID", ""),
-        "In-Reply-To": msg.get("In-Reply-To", ""),
-        "References": msg.get("References", ""),
-        "Reply-To": msg.get("Reply-To", ""),
+
+def parse_headers_only(email_bytes: bytes) -> email.message.Message:
+    """Parse just the header block; the body is left as an unparsed string payload."""
+    return _HEADER_PARSER.parsebytes(email_bytes[:FULL_PARSE_LIMIT])
+
+
+_DELIM_LINE_RE = re.compile(rb"\n--([^\r\n]+)")
+PART_HEADER_SCAN = 16 * 1024  # bytes after a boundary line searched for the part's headers
+
+
+def _part_headers_after(
+    email_bytes: bytes, cap: int, msg: email.message.Message,
+) -> list[email.message.Message]:
+    """Header-only Messages for the MIME parts whose boundary line isn't inside cap.
+
+    msg is the parse of the first cap bytes; its multiparts give the known
+    boundaries, and nested multiparts found past the cap add theirs.
+    """
+    boundaries = {
+        b.encode("latin-1", errors="replace")
+        for part in msg.walk() if part.is_multipart() and (b := part.get_boundary())
     }
+    # Start on the line the cap cuts through, so a half-read boundary line is rescanned
+    start = email_bytes.rfind(b"\n", 0, cap)
+    parts = []
+    for m in _DELIM_LINE_RE.finditer(email_bytes, max(start, 0)):
+        token = m.group(1).rstrip()
+        if token not in boundaries:
+            continue  # closing delimiter ("--b--") or payload text
+        hm = _HEADER_END_RE.search(email_bytes, m.end(), m.end() + PART_HEADER_SCAN)
+        if not hm:
+            continue
+        part = _HEADER_PARSER.parsebytes(email_bytes[m.end() : hm.end()].lstrip(b"\r\n"))
+        if part.get_content_maintype() == "multipart" and (b := part.get_boundary()):
+            boundaries.add(b.encode("latin-1", errors="replace"))
+        parts.append(part)
+    return parts
+
+
+def parse_body(email_bytes: bytes, msg: email.message.Message) -> dict:
+    """Body preview and attachment list for a message whose headers are already parsed.
+
+    Single-part messages are decoded straight from the headers-only msg; only
+    multipart messages pay for a full MIME parse. The email package eagerly
+    builds every MIME part, attachments included, so it is handed at most
+    FULL_PARSE_LIMIT bytes. That always covers the leading text/plain part;
+    parts that start past the cap are found by a byte scan for their
+    boundary and only their headers are parsed.
+    """
+    later_parts: list[email.message.Message] = []
+    if msg.get_content_maintype() == "multipart":
+        msg = email.message_from_bytes(email_bytes[:FULL_PARSE_LIMIT])
+        if len(email_bytes) > FULL_PARSE_LIMIT:
+            later_parts = _part_headers_after(email_bytes, FULL_PARSE_LIMIT, msg)
 
     body = ""
     if msg.is_multipart():
@@ -116,16 +254,71 @@ def parse_emlx_full(path: Path) -> dict | None:
         if payload:
             body = payload.decode("utf-8", errors="replace")
 
-    result["body_preview"] = re.sub(r"\s+", " ", body.strip())[:400]
-    result["attachments"] = []
-    for part in msg.walk():
+    attachments = []
+    for part in [*msg.walk(), *later_parts]:
         if part.get("Content-Disposition"):
             fn = part.get_filename()
-            result["attachments"].append({"filename": fn, "content_type": part.get_content_type()})
+            attachments.append({"filename": fn, "content_type": part.get_content_type()})
+    return {"body_preview": _WS_RE.sub(" ", body.strip())[:400], "attachments": attachments}
 
+
+def _full_parse(email_bytes: bytes) -> dict | None:
+    """Fallback for messages _fast_parse can't handle, using the email package."""
+    try:
+        msg = parse_headers_only(email_bytes)
+        result = {name: str(msg.get(name, "")) for name in REPORT_HEADERS}
+        result.update(parse_body(email_bytes, msg))
+    except Exception:
+        return None
     return result
 
 
+def parse_emlx_full(path: Path) -> dict | None:
+    """Parse .emlx and extract all available headers and body.
+
+    Reads a PREFIX_READ-byte prefix first. That answers for single-part
+    messages and for multipart messages that end inside it; anything else
+    (typically a message with attachments) is read in full so every part is
+    listed.
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(PREFIX_READ)
+            if len(raw) == PREFIX_READ:
+                email_bytes = _locate_email(raw)
+                parsed = _fast_parse(email_bytes, truncated=True) if email_bytes else None
+                if parsed is not None:
+                    return parsed
+                raw += f.read()
+    except OSError:
+        return None
+
+    email_bytes = _locate_email(raw)
+    if not email_bytes:
+        return None
+    return _fast_parse(email_bytes) or _full_parse(email_bytes)
+
+
+def _norm_msgid(s: str | None) -> str:
+    return (s or "").strip().strip("<>")
+
+
+def _norm_subject(s: str | None) -> str:
+    return _WS_RE.sub(" ", (s or "").strip())[:80]
+
+
+MESSAGES_SQL = """
+    SELECT m.ROWID, m.global_message_id, m.date_received, m.read, m.deleted, m.flagged,
+           m.mailbox, m.sender, m.subject, m.summary,
+           sub.subject as subject_text, a.address as sender_addr
+    FROM messages m
+    LEFT JOIN subjects sub ON m.subject = sub.ROWID
+    LEFT JOIN addresses a ON m.sender = a.ROWID
+    WHERE m.date_received >= ?
+    ORDER BY m.date_received DESC
+"""
+
+
 def main() -> None:
     if not MAIL_BASE.exists():
         print("~/Library/Mail not found")
@@ -137,31 +330,34 @@ def main() -> None:
         return
 
     cutoff = time.time() - 2 * SECONDS_PER_DAY
-    tmp = copy_db(idx)
-    conn = sqlite3.connect(tmp)
+    conn, tmp = open_envelope_db(idx)
 
     print("=" * 60)
     print("MAIL DATA REPORT — last 2 days")
     print("=" * 60)
 
-    # 1. Messages from DB
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT m.ROWID, m.global_message_id, m.date_received, m.read, m.deleted, m.flagged,
-               m.mailbox, m.sender, m.subject, m.summary,
-               sub.subject as subject_text
-        FROM messages m
-        LEFT JOIN subjects sub ON m.subject = sub.ROWID
-        WHERE m.date_received >= ?
-        ORDER BY m.date_received DESC
-    """,
-        (cutoff,),
-    )
-    db_rows = cur.fetchall()
-    [d[0] for d in cur.description]
+    # All report queries share one read transaction (and its page cache) on one cursor
+    conn.execute("BEGIN")
 
-    print(f"\n[DB] Messages (date_received >= 2 days ago): {len(db_rows)}")
+    # 1. Messages from DB, with subject text and sender address resolved in the same scan
+    #    (messages.sender = addresses.ROWID in Apple Mail)
+    cur = conn.cursor()
+    cur.arraysize = 1000
+    # Stream rows: only counts, sender addresses and the newest few rows are kept
+    db_count = 0
+    subject_hits = 0
+    sender_map = {}
+    sample_rows = []
+    for row in cur.execute(MESSAGES_SQL, (cutoff,)):
+        db_count += 1
+        if row[10]:
+            subject_hits += 1
+        if row[11]:
+            sender_map[row[0]] = row[11]
+        if len(sample_rows) < SAMPLE_DB_ROWS:
+            sample_rows.append(row)
+
+    print(f"\n[DB] Messages (date_received >= 2 days ago): {db_count}")
 
     # 2. Mailboxes - resolve ROWID to human name (Inbox, Sent, etc.)
     mailbox_map = {}
@@ -181,32 +377,14 @@ def main() -> None:
     except sqlite3.OperationalError:
         pass
 
-    # 3. Sender addresses (messages.sender = addresses.ROWID in Apple Mail)
-    sender_map = {}
-    try:
-        cur.execute(
-            """
-            SELECT m.ROWID, a.address
-            FROM messages m
-            LEFT JOIN addresses a ON m.sender = a.ROWID
-            WHERE m.date_received >= ? AND m.sender IS NOT NULL
-        """,
-            (cutoff,),
-        )
-        for r in cur.fetchall():
-            if r[1]:
-                sender_map[r[0]] = r[1]
-    except sqlite3.OperationalError:
-        pass
-
-    # 4. Recipients
+    # 3. Recipients
     recipients_found = []
     try:
         cur.execute("PRAGMA table_info(recipients)")
         rec_cols = [r[1] for r in cur.fetchall()]
         msg_col = "message_id" if "message_id" in rec_cols else "message"
         addr_col = "address" if "address" in rec_cols else "address_id"
-        cur.execute(
+        recipients_found = cur.execute(
             f"""
             SELECT r.{msg_col}, a.address
             FROM recipients r
@@ -214,34 +392,32 @@ def main() -> None:
             WHERE r.{msg_col} IN (SELECT ROWID FROM messages WHERE date_received >= ?)
         """,
             (cutoff,),
-        )
-        recipients_found = cur.fetchall()
+        ).fetchall()
     except sqlite3.OperationalError:
         pass
 
-    # 5. Attachments
+    # 4. Attachments
     attachments_found = []
     try:
         cur.execute("PRAGMA table_info(attachments)")
         att_cols = [r[1] for r in cur.fetchall()]
         msg_col = "message_id" if "message_id" in att_cols else "message"
         fn_col = "filename" if "filename" in att_cols else "name"
-        cur.execute(
+        attachments_found = cur.execute(
             f"""
             SELECT {msg_col}, {fn_col}
             FROM attachments
             WHERE {msg_col} IN (SELECT ROWID FROM messages WHERE date_received >= ?)
         """,
             (cutoff,),
-        )
-        attachments_found = cur.fetchall()
+        ).fetchall()
     except sqlite3.OperationalError:
         pass
 
-    # 6. Labels
+    # 5. Labels
     labels_found = []
     try:
-        cur.execute(
+        labels_found = cur.execute(
             """
             SELECT m.ROWID, l.name
             FROM messages m
@@ -250,15 +426,14 @@ def main() -> None:
             WHERE m.date_received >= ?
         """,
             (cutoff,),
-        )
-        labels_found = cur.fetchall()
+        ).fetchall()
     except sqlite3.OperationalError:
         pass
 
-    # 7. Generated summaries
+    # 6. Generated summaries
     summaries_found = []
     try:
-        cur.execute(
+        summaries_found = cur.execute(
             """
             SELECT m.ROWID, gs.ROWID
             FROM messages m
@@ -266,24 +441,41 @@ def main() -> None:
             WHERE m.date_received >= ? AND gs.summary IS NOT NULL
         """,
             (cutoff,),
-        )
-        summaries_found = cur.fetchall()
+        ).fetchall()
     except sqlite3.OperationalError:
         pass
 
+    # 7. Message-ID headers for the sample rows (messages.global_message_id ->
+    #    message_global_data.ROWID), used to match DB rows to parsed .emlx files
+    sample_msgids = {}
+    try:
+        gids = [r[1] for r in sample_rows if r[1] is not None]
+        marks = ",".join("?" * len(gids))
+        sample_msgids = dict(cur.execute(
+            f"SELECT ROWID, message_id_header FROM message_global_data WHERE ROWID IN ({marks})",
+            gids,
+        ).fetchall())
+    except sqlite3.OperationalError:
+        pass
+
+    conn.execute("COMMIT")
     conn.close()
-    Path(tmp).unlink(missing_ok=True)
+    remove_tmp_db(tmp)
 
     # 8. .emlx files from last 2 days
-    emlx_files = [p for p in MAIL_BASE.rglob("*.emlx") if p.stat().st_mtime >= cutoff]
-    emlx_files += [p for p in MAIL_BASE.rglob("*.partial.emlx") if p.stat().st_mtime >= cutoff]
-    emlx_files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    #    Stat each file once; "*.emlx" already matches "*.partial.emlx".
+    emlx_files = [(p, p.stat().st_mtime) for p in MAIL_BASE.rglob("*.emlx")]
+    emlx_files = [x for x in emlx_files if x[1] >= cutoff]
+    emlx_files.sort(key=lambda x: x[1], reverse=True)
 
     print(f"[FILES] .emlx modified in last 2 days: {len(emlx_files)}")
 
-    # Parse each emlx
+    # Parse each emlx, indexing From by Message-ID (and normalized subject as a
+    # lossy fallback) for the DB sender lookup below
     emlx_data = []
-    for path in emlx_files:
+    emlx_by_msgid = {}
+    emlx_by_subject = {}
+    for path, _mtime in emlx_files:
         parsed = parse_emlx_full(path)
         if parsed:
             parsed["_path"] = str(path.relative_to(MAIL_BASE))
@@ -293,6 +485,12 @@ def main() -> None:
                     parsed["_mailbox"] = part.replace(".mbox", "")
                     break
             emlx_data.append(parsed)
+            msgid = _norm_msgid(parsed.get("Message-ID"))
+            if msgid:
+                emlx_by_msgid[msgid] = parsed.get("From", "")
+            subj = _norm_subject(parsed.get("Subject"))
+            if subj:
+                emlx_by_subject[subj] = parsed.get("From", "")
 
     # Report
     print("\n" + "-" * 60)
@@ -300,11 +498,11 @@ def main() -> None:
     print("-" * 60)
 
     print("\n► FROM ENVELOPE INDEX (DB):")
-    print(f"  • Subject (from subjects join): {sum(1 for r in db_rows if r[10])} / {len(db_rows)}")
+    print(f"  • Subject (from subjects join): {subject_hits} / {db_count}")
     db_senders = len([v for v in sender_map.values() if v])
     sender_note = (
         f"{db_senders} from DB"
-        if db_senders >= len(db_rows)
+        if db_senders >= db_count
         else f"{db_senders} from DB, rest from .emlx fallback"
     )
     print(f"  • Sender address: {sender_note}")
@@ -316,45 +514,41 @@ def main() -> None:
 
     print("\n► FROM .emlx FILES:")
     if emlx_data:
-        emlx_data[0]
-        print(f"  • Parsed: {len(emlx_data)} files")
-        print(f"  • From: {sum(1 for e in emlx_data if e.get('From'))} / {len(emlx_data)}")
-        print(f"  • To: {sum(1 for e in emlx_data if e.get('To'))} / {len(emlx_data)}")
-        print(f"  • Cc: {sum(1 for e in emlx_data if e.get('Cc'))} / {len(emlx_data)}")
-        print(f"  • Bcc: {sum(1 for e in emlx_data if e.get('Bcc'))} / {len(emlx_data)}")
-        print(f"  • Subject: {sum(1 for e in emlx_data if e.get('Subject'))} / {len(emlx_data)}")
-        print(f"  • Date: {sum(1 for e in emlx_data if e.get('Date'))} / {len(emlx_data)}")
-        print(
-            f"  • Message-ID: {sum(1 for e in emlx_data if e.get('Message-ID'))} / {len(emlx_data)}"
-        )
-        in_reply_count = sum(1 for e in emlx_data if e.get("In-Reply-To"))
-        print(f"  • In-Reply-To (threading): {in_reply_count} / {len(emlx_data)}")
-        refs_count = sum(1 for e in emlx_data if e.get("References"))
-        print(f"  • References (threading): {refs_count} / {len(emlx_data)}")
-        body_count = sum(1 for e in emlx_data if e.get("body_preview"))
-        print(f"  • Body preview: {body_count} / {len(emlx_data)}")
-        att_count = sum(len(e.get("attachments", [])) for e in emlx_data)
+        n = len(emlx_data)
+        counts = dict.fromkeys(REPORT_HEADERS + ("body_preview",), 0)
+        att_count = 0
+        for e in emlx_data:
+            for k in counts:
+                if e.get(k):
+                    counts[k] += 1
+            att_count += len(e.get("attachments", ()))
+        print(f"  • Parsed: {n} files")
+        print(f"  • From: {counts['From']} / {n}")
+        print(f"  • To: {counts['To']} / {n}")
+        print(f"  • Cc: {counts['Cc']} / {n}")
+        print(f"  • Bcc: {counts['Bcc']} / {n}")
+        print(f"  • Subject: {counts['Subject']} / {n}")
+        print(f"  • Date: {counts['Date']} / {n}")
+        print(f"  • Message-ID: {counts['Message-ID']} / {n}")
+        print(f"  • In-Reply-To (threading): {counts['In-Reply-To']} / {n}")
+        print(f"  • References (threading): {counts['References']} / {n}")
+        print(f"  • Body preview: {counts['body_preview']} / {n}")
         print(f"  • Attachments (from MIME): {att_count} total")
     else:
         print("  • No .emlx files parsed (all failed or none in date range)")
 
-    # Build emlx lookup for sender fallback: (subject_normalized) -> From
-    def _norm(s):
-        return re.sub(r"\s+", " ", (s or "").strip())[:80]
-
-    emlx_by_subject = {}
-    for e in emlx_data:
-        subj = _norm(e.get("Subject"))
-        if subj:
-            emlx_by_subject[subj] = e.get("From", "")
-
     print("\n► SAMPLE MESSAGES (first 5 from DB):")
-    for i, row in enumerate(db_rows[:5]):
-        rid, gid, ts, read, deleted, flagged, mb_id, sender_id, sub_id, summ_id, sub_text = row
+    for i, row in enumerate(sample_rows):
+        (
+            rid, gid, ts, read, deleted, flagged,
+            mb_id, sender_id, sub_id, summ_id, sub_text, _sender_addr,
+        ) = row
         mb_name = mailbox_map.get(mb_id, f"mailbox_{mb_id}")
         sender = sender_map.get(rid, "")
+        if not sender:
+            sender = emlx_by_msgid.get(_norm_msgid(sample_msgids.get(gid)), "")
         if not sender and sub_text:
-            sender = emlx_by_subject.get(_norm(sub_text), "")
+            sender = emlx_by_subject.get(_norm_subject(sub_text), "")
         print(
             f"\n  [{i + 1}] ROWID={rid} mailbox={mb_name}"
             f" read={read} deleted={deleted} flagged={flagged}"
@@ -1,28 +1,11 @@
 #!/usr/bin/env python3
 """Debug Mail DB schema — inspect senders, mailboxes, and joins."""
 
-import os
-import shutil
-import sqlite3
-import tempfile
 import time
-from pathlib import Path
-
-CUTOFF = int(time.time()) - 2 * 86400
-
-MAIL_BASE = Path("~/Library/Mail").expanduser()
 
+from _mail_common import find_envelope_index, open_envelope_db, remove_tmp_db
 
-def find_envelope_index() -> Path | None:
-    try:
-        versions = [p for p in MAIL_BASE.iterdir() if p.is_dir() and p.name.startswith("V")]
-    except OSError:
-        return None
-    for v in sorted(versions, key=lambda p: p.name, reverse=True):
-        p = v / "MailData" / "Envelope Index"
-        if p.exists():
-            return p
-    return None
+CUTOFF = int(time.time()) - 2 * 86400
 
 
 def main() -> None:
@@ -31,14 +14,7 @@ def main() -> None:
         print("Envelope Index not found")
         return
 
-    fd, tmp = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    shutil.copy2(str(idx), tmp)
-    for suffix in ("-wal", "-shm"):
-        if Path(str(idx) + suffix).exists():
-            shutil.copy2(str(idx) + suffix, tmp + suffix)
-
-    conn = sqlite3.connect(tmp)
+    conn, tmp = open_envelope_db(idx)
     cur = conn.cursor()
 
     print("=== MAILBOXES ===")
@@ -122,7 +98,7 @@ def main() -> None:
         print("  ", row)
 
     conn.close()
-    Path(tmp).unlink(missing_ok=True)
+    remove_tmp_db(tmp)
 
 
 if __name__ == "__main__":
@@ -4,53 +4,22 @@ Run with Full Disk Access: System Settings > Privacy & Security > Full Disk Acce
 Then: python scripts/explore_mail_schema.py
 """
 
-import os
-import shutil
 import sqlite3
-import tempfile
-from pathlib import Path
 
-MAIL_BASE = Path("~/Library/Mail").expanduser()
-
-
-def find_envelope_index() -> Path | None:
-    try:
-        top_level = list(MAIL_BASE.iterdir())
-    except OSError:
-        print("Permission denied — grant Full Disk Access to Terminal")
-        return None
-
-    print("~/Library/Mail contents:", [p.name for p in sorted(top_level)])
-    versions = [p for p in top_level if p.is_dir() and p.name.startswith("V")]
-    if not versions:
-        print("No V* version folders — Mail may use a different structure or not be set up")
-        return None
-
-    for v in sorted(versions, key=lambda p: p.name, reverse=True):
-        maildata = v / "MailData"
-        if not maildata.exists():
-            continue
-        for name in ("Envelope Index", "Envelope Index.db"):
-            p = maildata / name
-            if p.exists():
-                return p
-
-    # Fallback: search for SQLite files under MailData
-    for v in sorted(versions, key=lambda p: p.name, reverse=True):
-        maildata = v / "MailData"
-        for f in maildata.iterdir() if maildata.exists() else []:
-            if f.is_file() and (
-                f.suffix in (".db", ".sqlite") or "Envelope" in f.name or "envelope" in f.name
-            ):
-                print(f"Found candidate: {f}")
-                return f
-    return None
+from _mail_common import MAIL_BASE, find_envelope_index, open_envelope_db, remove_tmp_db
 
 
 def main() -> None:
     if not MAIL_BASE.exists():
         print("~/Library/Mail not found (Mail may not be set up)")
         return
+    try:
+        top_level = sorted(MAIL_BASE.iterdir())
+    except OSError:
+        print("Permission denied — grant Full Disk Access to Terminal")
+        return
+    print("~/Library/Mail contents:", [p.name for p in top_level])
+
     idx = find_envelope_index()
     if not idx:
         print("Envelope Index not found")
@@ -58,13 +27,7 @@ def main() -> None:
     print(f"Found: {idx}\n")
 
     try:
-        fd, tmp = tempfile.mkstemp(suffix=".db")
-        os.close(fd)
-        shutil.copy2(str(idx), tmp)
-        for suffix in ("-wal", "-shm"):
-            src = str(idx) + suffix
-            if Path(src).exists():
-                shutil.copy2(src, tmp + suffix)
+        conn, tmp = open_envelope_db(idx)
     except PermissionError:
         print("Permission denied — grant Full Disk Access to Terminal")
         return
@@ -72,7 +35,6 @@ def main() -> None:
         print(f"Copy failed: {e}")
         return
 
-    conn = sqlite3.connect(tmp)
     cur = conn.cursor()
 
     print("=== TABLES ===")
@@ -263,7 +225,7 @@ def main() -> None:
         print("  ", e)
 
     conn.close()
-    Path(tmp).unlink(missing_ok=True)
+    remove_tmp_db(tmp)
     print("\nDone.")
 
 
@@ -3,11 +3,13 @@
 from snoopy_native import (
     extract_attributed_body_text,
     parse_lsof_output,
+    parse_ps_comm_output,
     parse_transcript,
 )
 
 __all__ = [
     "extract_attributed_body_text",
     "parse_lsof_output",
+    "parse_ps_comm_output",
     "parse_transcript",
 ]
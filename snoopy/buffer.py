@@ -1,7 +1,10 @@
 """Thread-safe event buffer that flushes to SQLite in batches."""
 
+import itertools
 import logging
+import operator
 import threading
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 import snoopy.config as config
@@ -10,58 +13,69 @@ from snoopy.db import Database
 log = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Event:
     """A single collected event destined for a DB table."""
     table: str
-    columns: list[str]
+    columns: Sequence[str]
     values: tuple
 
 
+_by_table = operator.attrgetter("table")
+
+
 class EventBuffer:
     """Accumulates events from collector threads and flushes them to the DB."""
 
     def __init__(self, db: Database):
         self._db = db
         self._lock = threading.Lock()
+        # Serialises flushes against each other; collectors only ever take _lock
+        self._write_lock = threading.Lock()
         self._events: list[Event] = []
 
     def push(self, event: Event):
         with self._lock:
             self._events.append(event)
-            if len(self._events) >= config.BUFFER_MAX_SIZE:
-                self._flush_locked()
+            full = len(self._events) >= config.BUFFER_MAX_SIZE
+        if full:
+            self.flush()
 
     def push_many(self, events: list[Event]):
         with self._lock:
             self._events.extend(events)
-            if len(self._events) >= config.BUFFER_MAX_SIZE:
-                self._flush_locked()
+            full = len(self._events) >= config.BUFFER_MAX_SIZE
+        if full:
+            self.flush()
 
     def flush(self):
-        """Flush all pending events to the database."""
-        with self._lock:
-            self._flush_locked()
-
-    def _flush_locked(self):
-        """Must be called while holding self._lock."""
-        if not self._events:
-            return
-        # Group by table for batch inserts
-        by_table: dict[str, tuple[list[str], list[tuple]]] = {}
-        for ev in self._events:
-            key = ev.table
-            if key not in by_table:
-                by_table[key] = (ev.columns, [])
-            by_table[key][1].append(ev.values)
-
-        count = len(self._events)
-        self._events.clear()
-
-        for table, (columns, rows) in by_table.items():
+        """Flush all pending events to the database.
+
+        The pending list is swapped out under the lock and written after it is
+        released, so collectors keep pushing while SQLite does the I/O.
+        _write_lock is taken before the swap, so concurrent flushes write their
+        batches in the order they were taken.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._events:
+                    return
+                pending = self._events
+                self._events = []
+            self._write(pending)
+
+    def _write(self, events: list[Event]):
+        # Stable sort keeps per-table insertion order; groupby then yields one batch per table
+        events.sort(key=_by_table)
+
+        tables = 0
+        for table, group in itertools.groupby(events, key=_by_table):
+            group = list(group)
+            rows = [ev.values for ev in group]
+            tables += 1
             try:
-                self._db.batch_insert(table, columns, rows)
+                self._db.batch_insert(table, group[0].columns, rows)
             except Exception:
                 log.exception("flush failed for table %s (%d rows)", table, len(rows))
 
-        log.debug("flushed %d events across %d tables", count, len(by_table))
+        log.debug("flushed %d events across %d tables", len(events), tables)
@@ -1,6 +1,8 @@
 """snoopy CLI — install, start, stop, and manage the snoopy daemon."""
 
 import argparse
+import functools
+import os
 import shutil
 import sqlite3
 import subprocess
@@ -19,16 +21,20 @@ def _python() -> str:
     return sys.executable
 
 
+@functools.cache
 def _project_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
 
 def _is_running() -> bool:
+    # Ask for just our service; exit status says whether it's loaded, so the
+    # output (and every other agent's entry) never has to be read
     try:
-        out = subprocess.run(
-            ["launchctl", "list"], capture_output=True, text=True
-        ).stdout
-        return _PLIST_LABEL in out
+        result = subprocess.run(
+            ["launchctl", "print", f"gui/{os.getuid()}/{_PLIST_LABEL}"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        return result.returncode == 0
     except OSError:
         return False
 
@@ -42,18 +48,14 @@ def _pid() -> int | None:
     return None
 
 
-def _generate_plist() -> str:
-    python = _python()
-    root = _project_root()
-    data = DATA_DIR
-    return textwrap.dedent(f"""\
+_PLIST_TEMPLATE = textwrap.dedent("""\
         <?xml version="1.0" encoding="UTF-8"?>
         <!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN"
           "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
         <plist version="1.0">
         <dict>
             <key>Label</key>
-            <string>{_PLIST_LABEL}</string>
+            <string>{label}</string>
             <key>ProgramArguments</key>
             <array>
                 <string>{python}</string>
@@ -85,6 +87,13 @@ def _generate_plist() -> str:
         </plist>""")
 
 
+@functools.cache
+def _generate_plist() -> str:
+    return _PLIST_TEMPLATE.format(
+        label=_PLIST_LABEL, python=_python(), root=_project_root(), data=DATA_DIR,
+    )
+
+
 # ── Permissions ───────────────────────────────────────────────────────────
 
 
@@ -323,15 +332,17 @@ def cmd_status(args: argparse.Namespace) -> None:
         print(f"  Database     {size_mb:.1f} MB")
 
         try:
-            conn = sqlite3.connect(str(DB_PATH))
+            # Read-only so status never contends with the daemon's writes
+            conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
+            conn.execute("PRAGMA query_only=1")
             cur = conn.cursor()
             cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = [r[0] for r in cur.fetchall() if not r[0].startswith("sqlite_")]
             total = 0
-            for t in tables:
-                cur.execute(f"SELECT COUNT(*) FROM [{t}]")
-                count = cur.fetchone()[0]
-                total += count
+            if tables:
+                # One statement for every table instead of a COUNT(*) round trip each
+                cur.execute(" UNION ALL ".join(f"SELECT COUNT(*) FROM [{t}]" for t in tables))
+                total = sum(r[0] for r in cur.fetchall())
             conn.close()
             print(f"  Events       {total:,} across {len(tables)} tables")
         except sqlite3.Error:
@@ -342,6 +353,22 @@ def cmd_status(args: argparse.Namespace) -> None:
     print()
 
 
+def _tail(path: Path, n: int, chunk: int = 65536) -> list[str]:
+    """Return the last n lines of path, reading backwards from EOF in chunks."""
+    if n <= 0:
+        return []
+    with open(path, "rb") as f:
+        pos = f.seek(0, 2)
+        buf = b""
+        # n + 1 newlines guarantee the first kept line is complete
+        while pos > 0 and buf.count(b"\n") <= n:
+            read = min(chunk, pos)
+            pos -= read
+            f.seek(pos)
+            buf = f.read(read) + buf
+    return buf.decode(errors="replace").splitlines()[-n:]
+
+
 def cmd_logs(args: argparse.Namespace) -> None:
     log_file = LOG_PATH
     if not log_file.exists():
@@ -352,9 +379,7 @@ def cmd_logs(args: argparse.Namespace) -> None:
             print(f"No log files found at {DATA_DIR}")
             return
 
-    lines = log_file.read_text().splitlines()
-    n = args.lines
-    for line in lines[-n:]:
+    for line in _tail(log_file, args.lines):
         print(line)
 
 
@@ -1,51 +1,89 @@
 """App lifecycle collector — tracks application launches and quits.
 
-Uses `ps` to get running process info and diffs against previous snapshot.
+Reads every process's executable path via libproc (falling back to `ps`)
+and diffs against previous snapshot.
 New apps → launch event, missing apps → quit event.
 
-We use subprocess instead of NSWorkspace.runningApplications() because
-the latter returns stale data from daemon background threads.
+We avoid NSWorkspace.runningApplications() because it returns stale data
+from daemon background threads.
 """
 
+import ctypes
 import logging
-import re
 import subprocess
+import sys
 import time
 
 import snoopy.config as config
+from snoopy._native import parse_ps_comm_output
 from snoopy.buffer import Event
 from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
-# Match lines from: ps -eo pid,comm
-# Example: "  1234 /Applications/Safari.app/Contents/MacOS/Safari"
-_APP_RE = re.compile(r"/Applications/(.+?)\.app/")
-_SYSTEM_APP_RE = re.compile(r"/System/Applications/(.+?)\.app/")
-_CORE_SERVICES_RE = re.compile(r"/CoreServices/(.+?)\.app/")
+
+PROC_ALL_PIDS = 1
+PROC_PIDPATHINFO_MAXSIZE = 4096
+
+
+def _load_libproc():
+    """Return libproc on macOS, or None where it isn't available."""
+    if sys.platform != "darwin":
+        return None
+    try:
+        lib = ctypes.CDLL("/usr/lib/libproc.dylib")
+    except OSError:
+        return None
+    lib.proc_listpids.argtypes = [ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p, ctypes.c_int]
+    lib.proc_listpids.restype = ctypes.c_int
+    lib.proc_pidpath.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint32]
+    lib.proc_pidpath.restype = ctypes.c_int
+    return lib
+
+
+_libproc = _load_libproc()
+
+
+def _list_process_paths() -> list[bytes] | None:
+    """Return the executable path of every visible process, or None without libproc."""
+    if _libproc is None:
+        return None
+    size = _libproc.proc_listpids(PROC_ALL_PIDS, 0, None, 0)
+    if size <= 0:
+        return None
+    # Headroom for processes spawned between the two calls
+    pids = (ctypes.c_int * (size // ctypes.sizeof(ctypes.c_int) + 32))()
+    size = _libproc.proc_listpids(PROC_ALL_PIDS, 0, pids, ctypes.sizeof(pids))
+    if size <= 0:
+        return None
+
+    buf = ctypes.create_string_buffer(PROC_PIDPATHINFO_MAXSIZE)
+    paths = []
+    for pid in pids[:size // ctypes.sizeof(ctypes.c_int)]:
+        if pid > 0 and _libproc.proc_pidpath(pid, buf, PROC_PIDPATHINFO_MAXSIZE) > 0:
+            paths.append(buf.value)
+    return paths
 
 
 def _get_running_apps() -> set[str]:
     """Return set of running app names extracted from process paths.
 
-    Uses `ps` which always returns fresh data regardless of thread context.
+    Both libproc and `ps` return fresh data regardless of thread context;
+    libproc just skips the fork/exec.
     """
+    paths = _list_process_paths()
+    if paths is not None:
+        return parse_ps_comm_output(b"\n".join(paths))
+
     result = subprocess.run(
         ["ps", "-eo", "comm"],
-        capture_output=True, text=True, timeout=5,
+        capture_output=True, timeout=5,
     )
     if result.returncode != 0:
         return set()
 
-    apps = set()
-    for line in result.stdout.splitlines():
-        line = line.strip()
-        for pattern in (_APP_RE, _SYSTEM_APP_RE, _CORE_SERVICES_RE):
-            m = pattern.search(line)
-            if m:
-                apps.add(m.group(1))
-                break
-    return apps
+    # Rust scans the raw bytes for .app paths and builds the set in one call
+    return parse_ps_comm_output(result.stdout)
 
 
 class AppLifecycleCollector(BaseCollector):
@@ -63,20 +101,24 @@ class AppLifecycleCollector(BaseCollector):
             log.info("[%s] first run — %d apps detected", self.name, len(current))
             return
 
+        events: list[Event] = []
         # Detect launches (in current but not in previous)
         for app_name in current - self._previous_apps:
-            self._log_app_event("launch", app_name)
+            self._log_app_event(events, "launch", app_name)
 
         # Detect quits (in previous but not in current)
         for app_name in self._previous_apps - current:
-            self._log_app_event("quit", app_name)
+            self._log_app_event(events, "quit", app_name)
 
+        # One buffer lock per cycle rather than one per event
+        if events:
+            self.buffer.push_many(events)
         self._previous_apps = current
 
-    def _log_app_event(self, event_type: str, app_name: str) -> None:
+    def _log_app_event(self, events: list[Event], event_type: str, app_name: str) -> None:
         if app_name in config.APP_EXCLUDED:
             return
-        self.buffer.push(Event(
+        events.append(Event(
             table="app_events",
             columns=["timestamp", "event_type", "app_name", "bundle_id"],
             values=(time.time(), event_type, app_name, ""),
@@ -1,17 +1,23 @@
 """Audio collector — tracks microphone and speaker usage via CoreAudio.
 
-Uses the CoreAudio C API (via ctypes) to check whether the default
-input/output audio devices are running. When a device becomes active,
-runs a targeted lsof to identify which process is using it.
+Push-based: CoreAudio property listeners (via ctypes) fire when the default
+input/output device starts or stops running, or when the default device
+changes. The HAL callback only enqueues; a drain thread re-reads the
+running state and, when a device becomes active, asks CoreAudio's process
+object list which client pids are doing I/O and names them with libproc's
+proc_name (lsof is only the fallback on systems without that list).
+Falls back to polling if the listeners can't be registered.
 Logs transitions only (active → inactive, inactive → active).
 """
 
 import ctypes
 import ctypes.util
 import logging
+import queue
 import subprocess
+import threading
 import time
-from ctypes import Structure, byref, c_uint32, sizeof
+from ctypes import CFUNCTYPE, POINTER, Structure, byref, c_int32, c_uint32, c_void_p, sizeof
 
 from snoopy.buffer import Event
 from snoopy.collectors.base import BaseCollector
@@ -27,6 +33,10 @@ kAudioObjectSystemObject = 1
 kAudioHardwarePropertyDefaultInputDevice = _fourcc("dIn ")
 kAudioHardwarePropertyDefaultOutputDevice = _fourcc("dOut")
 kAudioDevicePropertyDeviceIsRunningSomewhere = _fourcc("gone")
+kAudioHardwarePropertyProcessObjectList = _fourcc("prs#")  # macOS 14+
+kAudioProcessPropertyPID = _fourcc("ppid")
+kAudioProcessPropertyIsRunningInput = _fourcc("piri")
+kAudioProcessPropertyIsRunningOutput = _fourcc("piro")
 kAudioObjectPropertyScopeGlobal = _fourcc("glob")
 kAudioObjectPropertyElementMain = 0
 
@@ -39,10 +49,61 @@ class AudioObjectPropertyAddress(Structure):
     ]
 
 
+# OSStatus (*)(AudioObjectID, UInt32, const AudioObjectPropertyAddress*, void*)
+AudioObjectPropertyListenerProc = CFUNCTYPE(
+    c_int32, c_uint32, c_uint32, POINTER(AudioObjectPropertyAddress), c_void_p,
+)
+
+
 # Load CoreAudio framework
 _lib_path = ctypes.util.find_library("CoreAudio")
 _ca = ctypes.cdll.LoadLibrary(_lib_path) if _lib_path else None
 
+if _ca:
+    # Declared once so ctypes doesn't re-infer argument conversions on every call
+    _addr_p = POINTER(AudioObjectPropertyAddress)
+    _ca.AudioObjectGetPropertyData.argtypes = [
+        c_uint32, _addr_p, c_uint32, c_void_p, POINTER(c_uint32), c_void_p,
+    ]
+    _ca.AudioObjectGetPropertyData.restype = c_int32
+    _ca.AudioObjectGetPropertyDataSize.argtypes = [
+        c_uint32, _addr_p, c_uint32, c_void_p, POINTER(c_uint32),
+    ]
+    _ca.AudioObjectGetPropertyDataSize.restype = c_int32
+    for _fn in (_ca.AudioObjectAddPropertyListener, _ca.AudioObjectRemovePropertyListener):
+        _fn.argtypes = [c_uint32, _addr_p, AudioObjectPropertyListenerProc, c_void_p]
+        _fn.restype = c_int32
+
+try:
+    _libproc = ctypes.CDLL("/usr/lib/libproc.dylib")
+    _libproc.proc_name.argtypes = [ctypes.c_int, c_void_p, c_uint32]
+    _libproc.proc_name.restype = ctypes.c_int
+except OSError:
+    _libproc = None
+
+PROCESS_NAME_TTL = 30.0  # seconds a pid → name lookup stays cached
+_name_cache: dict[int, tuple[str, float]] = {}
+
+
+# Property addresses are const inputs to CoreAudio, so one instance per selector is shared
+_addresses: dict[int, AudioObjectPropertyAddress] = {}
+
+
+def _global_address(selector: int) -> AudioObjectPropertyAddress:
+    addr = _addresses.get(selector)
+    if addr is None:
+        addr = _addresses[selector] = AudioObjectPropertyAddress(
+            selector, kAudioObjectPropertyScopeGlobal, kAudioObjectPropertyElementMain,
+        )
+    return addr
+
+
+# Address and out-params for _is_device_running, the per-notification hot path.
+# Only the collector's drain thread calls it, so reusing the buffers is safe.
+_running_addr = _global_address(kAudioDevicePropertyDeviceIsRunningSomewhere)
+_running = c_uint32(0)
+_running_size = c_uint32(sizeof(c_uint32))
+
 
 def _get_default_device(is_input: bool) -> int | None:
     """Get the AudioObjectID of the default input or output device."""
@@ -52,37 +113,95 @@ def _get_default_device(is_input: bool) -> int | None:
         selector = kAudioHardwarePropertyDefaultInputDevice
     else:
         selector = kAudioHardwarePropertyDefaultOutputDevice
-    addr = AudioObjectPropertyAddress(
-        selector, kAudioObjectPropertyScopeGlobal,
-        kAudioObjectPropertyElementMain,
-    )
-    device_id = c_uint32(0)
-    size = c_uint32(sizeof(c_uint32))
-    status = _ca.AudioObjectGetPropertyData(
-        c_uint32(kAudioObjectSystemObject), byref(addr),
-        c_uint32(0), None, byref(size), byref(device_id),
-    )
-    return device_id.value if status == 0 else None
+    return _get_u32(kAudioObjectSystemObject, selector)
 
 
 def _is_device_running(device_id: int) -> bool:
     """Check if an audio device has any active audio streams."""
     if not _ca:
         return False
-    addr = AudioObjectPropertyAddress(
-        kAudioDevicePropertyDeviceIsRunningSomewhere,
-        kAudioObjectPropertyScopeGlobal,
-        kAudioObjectPropertyElementMain,
+    _running_size.value = sizeof(c_uint32)
+    status = _ca.AudioObjectGetPropertyData(
+        device_id, byref(_running_addr), 0, None, byref(_running_size), byref(_running),
     )
-    running = c_uint32(0)
+    return status == 0 and _running.value != 0
+
+
+def _add_listener(object_id: int, selector: int, proc) -> bool:
+    if not _ca:
+        return False
+    addr = _global_address(selector)
+    return _ca.AudioObjectAddPropertyListener(object_id, byref(addr), proc, None) == 0
+
+
+def _remove_listener(object_id: int, selector: int, proc) -> None:
+    if not _ca:
+        return
+    addr = _global_address(selector)
+    _ca.AudioObjectRemovePropertyListener(object_id, byref(addr), proc, None)
+
+
+def _get_u32(object_id: int, selector: int) -> int | None:
+    addr = _global_address(selector)
+    value = c_uint32(0)
     size = c_uint32(sizeof(c_uint32))
     status = _ca.AudioObjectGetPropertyData(
-        c_uint32(device_id), byref(addr), c_uint32(0), None, byref(size), byref(running)
+        object_id, byref(addr), 0, None, byref(size), byref(value)
     )
-    return running.value != 0 if status == 0 else False
+    return value.value if status == 0 else None
 
 
-def _find_audio_process() -> str:
+def _audio_client_pids(is_input: bool) -> list[int] | None:
+    """PIDs CoreAudio reports as doing input (or output) I/O right now.
+
+    Returns None where the process object list isn't supported (pre-macOS 14).
+    """
+    if not _ca:
+        return None
+    addr = _global_address(kAudioHardwarePropertyProcessObjectList)
+    size = c_uint32(0)
+    status = _ca.AudioObjectGetPropertyDataSize(
+        kAudioObjectSystemObject, byref(addr), 0, None, byref(size),
+    )
+    if status != 0:
+        return None
+    objects = (c_uint32 * (size.value // sizeof(c_uint32)))()
+    status = _ca.AudioObjectGetPropertyData(
+        kAudioObjectSystemObject, byref(addr), 0, None, byref(size), objects,
+    )
+    if status != 0:
+        return None
+
+    selector = (
+        kAudioProcessPropertyIsRunningInput if is_input else kAudioProcessPropertyIsRunningOutput
+    )
+    pids = []
+    for obj in objects[: size.value // sizeof(c_uint32)]:
+        if _get_u32(obj, selector):
+            pid = _get_u32(obj, kAudioProcessPropertyPID)
+            if pid:
+                pids.append(pid)
+    return pids
+
+
+def _process_name(pid: int) -> str:
+    """Name for pid via libproc, cached for PROCESS_NAME_TTL seconds."""
+    now = time.monotonic()
+    cached = _name_cache.get(pid)
+    if cached and cached[1] > now:
+        return cached[0]
+    name = ""
+    if _libproc:
+        buf = ctypes.create_string_buffer(256)
+        if _libproc.proc_name(pid, buf, sizeof(buf)) > 0:
+            name = buf.value.decode("utf-8", errors="replace")
+    if len(_name_cache) >= 128:
+        _name_cache.clear()  # pids are recycled; never let the map grow unbounded
+    _name_cache[pid] = (name, now + PROCESS_NAME_TTL)
+    return name
+
+
+def _lsof_audio_process() -> str:
     """Best-effort: find the process name currently using audio via lsof."""
     try:
         result = subprocess.run(
@@ -103,12 +222,33 @@ def _find_audio_process() -> str:
     return ""
 
 
-AUDIO_INTERVAL = 3  # seconds
+def _find_audio_process(is_input: bool) -> str:
+    """Best-effort: name of the process doing audio input (or output).
+
+    Asks CoreAudio which client processes are running I/O and resolves only
+    those pids; the system-wide lsof scan is kept for macOS versions without
+    the process object list.
+    """
+    pids = _audio_client_pids(is_input)
+    if pids is None:
+        return _lsof_audio_process()
+    for pid in pids:
+        name = _process_name(pid)
+        if name:
+            return name
+    return ""
+
+
+_AUDIO_COLS = ("timestamp", "device_type", "is_active", "process_name")
+
+AUDIO_INTERVAL = 3  # seconds — polling fallback when listeners can't be registered
+LISTENER_WAKE = 1.0  # seconds — how often the drain thread checks for stop
+AUDIO_DEBOUNCE = 0.75  # seconds — a state must hold this long after a notification to log
 
 
 class AudioCollector(BaseCollector):
     name = "audio"
-    interval = AUDIO_INTERVAL
+    interval = 0  # push-based: driven by CoreAudio property listeners
 
     def setup(self) -> None:
         self._input_device = _get_default_device(is_input=True)
@@ -122,6 +262,101 @@ class AudioCollector(BaseCollector):
             self._input_device, self._output_device,
         )
 
+        self._queue: queue.SimpleQueue[int] = queue.SimpleQueue()
+        # Strong ref: CoreAudio holds only the raw function pointer
+        self._listener_proc = AudioObjectPropertyListenerProc(self._on_property_changed)
+        self._listening = self._register_listeners()
+        if not self._listening:
+            log.warning("[%s] CoreAudio listeners unavailable — polling", self.name)
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._drain_loop, name=f"collector-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def teardown(self) -> None:
+        if getattr(self, "_listening", False):
+            self._unregister_listeners()
+            self._listening = False
+
+    # ── listeners ───────────────────────────────────────────────────────
+    def _on_property_changed(self, object_id, num_addresses, addresses, client_data):
+        # Runs on the HAL notification thread: enqueue and return, nothing else
+        self._queue.put_nowait(object_id)
+        return 0
+
+    def _device_ids(self) -> set[int]:
+        return {d for d in (self._input_device, self._output_device) if d}
+
+    def _register_listeners(self) -> bool:
+        proc = self._listener_proc
+        ok = _add_listener(kAudioObjectSystemObject, kAudioHardwarePropertyDefaultInputDevice, proc)
+        ok = ok and _add_listener(
+            kAudioObjectSystemObject, kAudioHardwarePropertyDefaultOutputDevice, proc,
+        )
+        for device in self._device_ids():
+            ok = ok and _add_listener(device, kAudioDevicePropertyDeviceIsRunningSomewhere, proc)
+        if not ok:
+            self._unregister_listeners()
+        return ok
+
+    def _unregister_listeners(self) -> None:
+        proc = self._listener_proc
+        _remove_listener(kAudioObjectSystemObject, kAudioHardwarePropertyDefaultInputDevice, proc)
+        _remove_listener(kAudioObjectSystemObject, kAudioHardwarePropertyDefaultOutputDevice, proc)
+        for device in self._device_ids():
+            _remove_listener(device, kAudioDevicePropertyDeviceIsRunningSomewhere, proc)
+
+    def _rebind_devices(self) -> None:
+        """Default device switched: move the running-state listeners to the new devices."""
+        old = self._device_ids()
+        self._input_device = _get_default_device(is_input=True)
+        self._output_device = _get_default_device(is_input=False)
+        new = self._device_ids()
+        proc = self._listener_proc
+        for device in old - new:
+            _remove_listener(device, kAudioDevicePropertyDeviceIsRunningSomewhere, proc)
+        for device in new - old:
+            _add_listener(device, kAudioDevicePropertyDeviceIsRunningSomewhere, proc)
+        log.info(
+            "audio devices changed: input=%s output=%s",
+            self._input_device, self._output_device,
+        )
+
+    def _drain_loop(self) -> None:
+        # Initial read so a device that was already running is logged
+        pending: set[int] = {0}
+        next_poll = 0.0
+        while not self._stop_event.is_set():
+            if not pending:
+                # Always wake every LISTENER_WAKE so stop() never outwaits the join;
+                # the polling fallback keeps its own AUDIO_INTERVAL deadline
+                try:
+                    pending.add(self._queue.get(timeout=LISTENER_WAKE))
+                except queue.Empty:
+                    if self._listening or time.monotonic() < next_poll:
+                        continue
+                else:
+                    # Let the device settle: an app briefly toggling I/O while it
+                    # swaps buffers reads back as its final state, not two edges
+                    if self._stop_event.wait(AUDIO_DEBOUNCE):
+                        break
+            # Coalesce a burst of notifications into a single re-read
+            while True:
+                try:
+                    pending.add(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if kAudioObjectSystemObject in pending and self._listening:
+                    self._rebind_devices()
+                self.collect()
+            except Exception:
+                log.exception("[%s] collection error", self.name)
+            pending.clear()
+            next_poll = time.monotonic() + AUDIO_INTERVAL
+
     def collect(self) -> None:
         now = time.time()
 
@@ -129,10 +364,10 @@ class AudioCollector(BaseCollector):
         if self._input_device:
             mic_active = _is_device_running(self._input_device)
             if mic_active != self._last_mic_active:
-                process = _find_audio_process() if mic_active else self._last_mic_process
+                process = _find_audio_process(True) if mic_active else self._last_mic_process
                 self.buffer.push(Event(
                     table="audio_events",
-                    columns=["timestamp", "device_type", "is_active", "process_name"],
+                    columns=_AUDIO_COLS,
                     values=(now, "microphone", int(mic_active), process),
                 ))
                 self._last_mic_active = mic_active
@@ -142,10 +377,12 @@ class AudioCollector(BaseCollector):
         if self._output_device:
             speaker_active = _is_device_running(self._output_device)
             if speaker_active != self._last_speaker_active:
-                process = _find_audio_process() if speaker_active else self._last_speaker_process
+                process = (
+                    _find_audio_process(False) if speaker_active else self._last_speaker_process
+                )
                 self.buffer.push(Event(
                     table="audio_events",
-                    columns=["timestamp", "device_type", "is_active", "process_name"],
+                    columns=_AUDIO_COLS,
                     values=(now, "speaker", int(speaker_active), process),
                 ))
                 self._last_speaker_active = speaker_active
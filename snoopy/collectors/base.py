@@ -43,6 +43,10 @@ class BaseCollector(abc.ABC):
     def teardown(self) -> None:
         """Optional cleanup (override in subclass)."""
 
+    def next_interval(self) -> float:
+        """Seconds to wait before the next cycle (override for adaptive polling)."""
+        return self.interval
+
     def start(self) -> None:
         """Start the collector in a background daemon thread."""
         self.setup()
@@ -78,9 +82,18 @@ class BaseCollector(abc.ABC):
 
     # ── internal ────────────────────────────────────────────────────────
     def _run_loop(self) -> None:
+        # Ticks are scheduled from the previous tick, not from when collect()
+        # returned, so the period doesn't drift by the collection time
+        next_tick = time.monotonic()
         while not self._stop_event.is_set():
             try:
                 self.collect()
             except Exception:
                 log.exception("[%s] collection error", self.name)
-            self._stop_event.wait(timeout=self.interval)
+            interval = self.next_interval()
+            next_tick += interval
+            now = time.monotonic()
+            if next_tick < now and interval > 0:
+                # collect() overran: skip the missed ticks instead of catching up back-to-back
+                next_tick += ((now - next_tick) // interval + 1) * interval
+            self._stop_event.wait(timeout=next_tick - now)
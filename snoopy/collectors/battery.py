@@ -1,13 +1,26 @@
 """Battery collector — tracks charge level, charging state, and power source.
 
-Polls `pmset -g batt` at a slow interval. Only logs on state change
-(percent, charging, or power source changed).
+Reads the power source state straight from IOKit (IOPSCopyPowerSourcesInfo
+via ctypes), falling back to `pmset -g batt` where IOKit isn't available.
+Only logs on state change (percent, charging, or power source changed).
+
+Push-based where possible: a notifyd subscription to powerd's power-source
+change notification wakes a watch thread, which re-reads the state. If the
+subscription can't be made, the collector polls instead, with an interval
+that adapts to how often the state has actually been changing: see
+BatteryCollector.next_interval().
 """
 
+import ctypes
+import ctypes.util
 import logging
-import re
+import os
+import select
 import subprocess
+import threading
 import time
+from collections import deque
+from ctypes import POINTER, byref, c_char_p, c_int, c_int32, c_long, c_uint32, c_void_p
 
 import snoopy.config as config
 from snoopy.buffer import Event
@@ -15,7 +28,15 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
-_BATT_RE = re.compile(r"(\d+)%;\s*(charging|discharging|charged|finishing charge)")
+_BATTERY_COLS = ("timestamp", "percent", "is_charging", "power_source")
+
+# pmset states after "NN%;", and whether each counts as charging
+_PMSET_STATES = (
+    ("charging", True),
+    ("discharging", False),
+    ("charged", False),
+    ("finishing charge", True),
+)
 
 
 def _parse_pmset(output: str) -> tuple[int, bool, str] | None:
@@ -29,15 +50,192 @@ def _parse_pmset(output: str) -> tuple[int, bool, str] | None:
     elif "'Battery Power'" in output:
         source = "battery"
 
-    match = _BATT_RE.search(output)
-    if not match:
+    # Scan for "<digits>%;" followed by a known state; a plain find()
+    # walk beats regex setup for output this short
+    i = output.find("%;")
+    while i >= 0:
+        j = i
+        while j > 0 and output[j - 1].isdecimal():
+            j -= 1
+        if j < i:
+            rest = output[i + 2:i + 64].lstrip()
+            for state, is_charging in _PMSET_STATES:
+                if rest.startswith(state):
+                    return int(output[j:i]), is_charging, source
+        i = output.find("%;", i + 2)
+    return None
+
+
+# ── IOKit power sources ────────────────────────────────────────────────
+kCFStringEncodingUTF8 = 0x08000100
+kCFNumberSInt32Type = 3
+
+
+def _load_frameworks():
+    """Return (IOKit, CoreFoundation) with the calls we use typed, or (None, None)."""
+    iokit_path = ctypes.util.find_library("IOKit")
+    cf_path = ctypes.util.find_library("CoreFoundation")
+    if not iokit_path or not cf_path:
+        return None, None
+    try:
+        iokit = ctypes.cdll.LoadLibrary(iokit_path)
+        cf = ctypes.cdll.LoadLibrary(cf_path)
+    except OSError:
+        return None, None
+
+    iokit.IOPSCopyPowerSourcesInfo.restype = c_void_p
+    iokit.IOPSCopyPowerSourcesList.argtypes = [c_void_p]
+    iokit.IOPSCopyPowerSourcesList.restype = c_void_p
+    iokit.IOPSGetPowerSourceDescription.argtypes = [c_void_p, c_void_p]
+    iokit.IOPSGetPowerSourceDescription.restype = c_void_p
+    iokit.IOPSGetProvidingPowerSourceType.argtypes = [c_void_p]
+    iokit.IOPSGetProvidingPowerSourceType.restype = c_void_p
+
+    cf.CFStringCreateWithCString.argtypes = [c_void_p, c_char_p, c_uint32]
+    cf.CFStringCreateWithCString.restype = c_void_p
+    cf.CFStringGetCString.argtypes = [c_void_p, c_char_p, c_long, c_uint32]
+    cf.CFStringGetCString.restype = ctypes.c_bool
+    cf.CFArrayGetCount.argtypes = [c_void_p]
+    cf.CFArrayGetCount.restype = c_long
+    cf.CFArrayGetValueAtIndex.argtypes = [c_void_p, c_long]
+    cf.CFArrayGetValueAtIndex.restype = c_void_p
+    cf.CFDictionaryGetValue.argtypes = [c_void_p, c_void_p]
+    cf.CFDictionaryGetValue.restype = c_void_p
+    cf.CFNumberGetValue.argtypes = [c_void_p, ctypes.c_int, c_void_p]
+    cf.CFNumberGetValue.restype = ctypes.c_bool
+    cf.CFBooleanGetValue.argtypes = [c_void_p]
+    cf.CFBooleanGetValue.restype = ctypes.c_bool
+    cf.CFRelease.argtypes = [c_void_p]
+    return iokit, cf
+
+
+_iokit, _cf = _load_frameworks()
+
+
+def _cfstr(s: str) -> int | None:
+    # Created once at import and intentionally never released
+    return _cf.CFStringCreateWithCString(None, s.encode(), kCFStringEncodingUTF8)
+
+
+if _cf:
+    _KEY_TYPE = _cfstr("Type")
+    _KEY_CURRENT = _cfstr("Current Capacity")
+    _KEY_MAX = _cfstr("Max Capacity")
+    _KEY_CHARGING = _cfstr("Is Charging")
+
+
+def _cf_to_str(ref) -> str:
+    buf = ctypes.create_string_buffer(64)
+    if ref and _cf.CFStringGetCString(ref, buf, len(buf), kCFStringEncodingUTF8):
+        return buf.value.decode()
+    return ""
+
+
+def _cf_to_int(ref) -> int | None:
+    value = c_int32(0)
+    if ref and _cf.CFNumberGetValue(ref, kCFNumberSInt32Type, byref(value)):
+        return value.value
+    return None
+
+
+_PROVIDING_SOURCE = {"AC Power": "ac", "Battery Power": "battery"}
+
+
+def _read_iokit() -> tuple[int, bool, str] | None:
+    """(percent, is_charging, power_source) from IOKit, or None without a battery."""
+    blob = _iokit.IOPSCopyPowerSourcesInfo()
+    if not blob:
+        return None
+    sources = None
+    try:
+        source = _PROVIDING_SOURCE.get(
+            _cf_to_str(_iokit.IOPSGetProvidingPowerSourceType(blob)), "unknown"
+        )
+        sources = _iokit.IOPSCopyPowerSourcesList(blob)
+        if not sources:
+            return None
+        for i in range(_cf.CFArrayGetCount(sources)):
+            desc = _iokit.IOPSGetPowerSourceDescription(
+                blob, _cf.CFArrayGetValueAtIndex(sources, i)
+            )
+            if not desc:
+                continue
+            if _cf_to_str(_cf.CFDictionaryGetValue(desc, _KEY_TYPE)) != "InternalBattery":
+                continue
+            current = _cf_to_int(_cf.CFDictionaryGetValue(desc, _KEY_CURRENT))
+            maximum = _cf_to_int(_cf.CFDictionaryGetValue(desc, _KEY_MAX))
+            if current is None or not maximum:
+                return None
+            charging = _cf.CFDictionaryGetValue(desc, _KEY_CHARGING)
+            is_charging = bool(charging) and _cf.CFBooleanGetValue(charging)
+            return round(current * 100 / maximum), is_charging, source
+        return None
+    finally:
+        if sources:
+            _cf.CFRelease(sources)
+        _cf.CFRelease(blob)
+
+
+def _read_pmset() -> tuple[int, bool, str] | None:
+    result = subprocess.run(
+        ["pmset", "-g", "batt"],
+        capture_output=True, text=True, timeout=5,
+    )
+    if result.returncode != 0:
         return None
+    return _parse_pmset(result.stdout)
+
+
+def _read_battery() -> tuple[int, bool, str] | None:
+    if _iokit and _cf:
+        return _read_iokit()
+    return _read_pmset()
 
-    percent = int(match.group(1))
-    state = match.group(2)
-    is_charging = state in ("charging", "finishing charge")
 
-    return percent, is_charging, source
+# ── notifyd ───────────────────────────────────────────────────────────
+# kIOPSNotifyAnyPowerSource: posted whenever any power source's state changes
+_NOTIFY_POWER_SOURCES = b"com.apple.system.powersources"
+NOTIFY_STATUS_OK = 0
+NOTIFY_WAKE = 1.0  # seconds — how often the watch thread checks for stop
+
+
+def _load_notify():
+    """Return libSystem with the notify(3) calls we use typed, or None."""
+    path = ctypes.util.find_library("System")
+    if not path:
+        return None
+    try:
+        lib = ctypes.cdll.LoadLibrary(path)
+        lib.notify_register_file_descriptor.argtypes = [
+            c_char_p, POINTER(c_int), c_int, POINTER(c_int),
+        ]
+    except (OSError, AttributeError):
+        return None
+    lib.notify_register_file_descriptor.restype = c_uint32
+    lib.notify_cancel.argtypes = [c_int]
+    lib.notify_cancel.restype = c_uint32
+    return lib
+
+
+_notify = _load_notify()
+
+
+def _register_notify(name: bytes) -> tuple[int, int] | None:
+    """(fd, token) for a notifyd registration: fd turns readable on each post."""
+    if not _notify:
+        return None
+    fd = c_int(-1)
+    token = c_int(-1)
+    status = _notify.notify_register_file_descriptor(name, byref(fd), 0, byref(token))
+    if status != NOTIFY_STATUS_OK:
+        return None
+    return fd.value, token.value
+
+
+def _cancel_notify(token: int) -> None:
+    # Cancelling the last registration on the fd also closes it
+    if _notify:
+        _notify.notify_cancel(token)
 
 
 class BatteryCollector(BaseCollector):
@@ -48,16 +246,62 @@ class BatteryCollector(BaseCollector):
         self._last_percent: int | None = None
         self._last_charging: bool | None = None
         self._last_source: str | None = None
+        # Seconds between consecutive observed changes, newest last
+        self._gaps: deque[float] = deque(maxlen=256)
+        self._last_change_at: float | None = None
 
-    def collect(self) -> None:
-        result = subprocess.run(
-            ["pmset", "-g", "batt"],
-            capture_output=True, text=True, timeout=5,
-        )
-        if result.returncode != 0:
+        self._subscription = _register_notify(_NOTIFY_POWER_SOURCES)
+        if self._subscription is None:
+            log.info("[%s] power source notifications unavailable — polling", self.name)
             return
+        # Push-based from here on: start() sees interval 0 and leaves the loop to us
+        self.interval = 0
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._watch_loop, name=f"collector-{self.name}", daemon=True
+        )
+        self._thread.start()
 
-        parsed = _parse_pmset(result.stdout)
+    def teardown(self) -> None:
+        if getattr(self, "_subscription", None):
+            _cancel_notify(self._subscription[1])
+            self._subscription = None
+
+    def _watch_loop(self) -> None:
+        fd = self._subscription[0]
+        while not self._stop_event.is_set():
+            try:
+                self.collect()
+            except Exception:
+                log.exception("[%s] collection error", self.name)
+            # Block until powerd posts a change, waking every NOTIFY_WAKE so
+            # stop() never outwaits the join
+            while not self._stop_event.is_set():
+                if select.select([fd], [], [], NOTIFY_WAKE)[0]:
+                    # One 4-byte token per post; a burst is drained in one read
+                    os.read(fd, 4096)
+                    break
+
+    def next_interval(self) -> float:
+        """Sleep until the next poll, from the empirical inter-change distribution.
+
+        Conditions the observed gaps on the time already elapsed since the last
+        change and sleeps for the lower quartile of the remaining time, so most
+        changes are caught soon after they happen. Clamped to
+        [BATTERY_MIN_INTERVAL, BATTERY_MAX_INTERVAL]; the upper bound is the
+        default interval, so quiet stretches never poll slower than before
+        (and slow polls can't stretch the measured gaps and feed on themselves).
+        """
+        if len(self._gaps) < config.BATTERY_ADAPT_MIN_SAMPLES or self._last_change_at is None:
+            return self.interval
+        elapsed = time.monotonic() - self._last_change_at
+        remaining = sorted(g - elapsed for g in self._gaps if g > elapsed)
+        # Already past every gap seen so far: fall back to the default cadence
+        sleep = remaining[len(remaining) // 4] if remaining else config.BATTERY_MAX_INTERVAL
+        return min(max(sleep, config.BATTERY_MIN_INTERVAL), config.BATTERY_MAX_INTERVAL)
+
+    def collect(self) -> None:
+        parsed = _read_battery()
         if parsed is None:
             return
 
@@ -69,12 +313,17 @@ class BatteryCollector(BaseCollector):
                 and source == self._last_source):
             return
 
+        now = time.monotonic()
+        if self._last_change_at is not None:
+            self._gaps.append(now - self._last_change_at)
+        self._last_change_at = now
+
         self._last_percent = percent
         self._last_charging = is_charging
         self._last_source = source
 
         self.buffer.push(Event(
             table="battery_events",
-            columns=["timestamp", "percent", "is_charging", "power_source"],
+            columns=_BATTERY_COLS,
             values=(time.time(), percent, int(is_charging), source),
         ))
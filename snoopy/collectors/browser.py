@@ -12,11 +12,10 @@ A per-browser watermark (last_visit_id) avoids re-importing old visits.
 import json
 import logging
 import os
-import re
-import shutil
 import sqlite3
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import snoopy.config as config
@@ -25,14 +24,75 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
-# Strip leading notification count prefix from browser titles: "(1) " → ""
-_NOTIF_COUNT_RE = re.compile(r"^\(\d+\)\s+")
+# Strip leading notification count prefix from browser titles: "(3) Gmail" → "Gmail".
+# Done in SQL so the trimming runs inside sqlite's row loop, not per row in Python.
+_TITLE_SQL = """CASE
+    WHEN u.title GLOB '([0-9]*) *'
+     AND substr(u.title, 2, instr(u.title, ') ') - 2) NOT GLOB '*[^0-9]*'
+    THEN ltrim(substr(u.title, instr(u.title, ') ') + 2))
+    ELSE u.title
+END"""
 
 # Chrome epoch offset: microseconds between 1601-01-01 and 1970-01-01
 _CHROME_EPOCH_OFFSET = 11644473600 * 1_000_000
 # Safari epoch offset: seconds between 2001-01-01 and 1970-01-01
 _SAFARI_EPOCH_OFFSET = 978307200
 
+# Shared per-table column tuples, so events don't each carry a fresh list
+_BROWSER_COLS = ("timestamp", "url", "title", "browser", "visit_duration_s")
+_SEARCH_COLS = ("timestamp", "term", "browser", "url")
+_DOWNLOAD_COLS = ("timestamp", "file_path", "source_url", "total_bytes", "mime_type", "browser")
+_BOOKMARK_COLS = ("timestamp", "url", "title", "folder", "browser")
+
+# Rows pulled per fetchmany() when catching up on history
+_FETCH_SIZE = 1024
+# Sources collected concurrently; bounds how many DB copies hit the disk at once
+_MAX_WORKERS = 4
+
+
+def _backup(src_uri: str, dst_conn: sqlite3.Connection) -> None:
+    # timeout=0: a locked source should fail fast, not wait 5s for the browser
+    src_conn = sqlite3.connect(src_uri, uri=True, timeout=0)
+    try:
+        # Take the read lock up front: Connection.backup() retries BUSY forever,
+        # so a locked source has to raise here instead
+        src_conn.execute("BEGIN")
+        src_conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        src_conn.backup(dst_conn)
+    finally:
+        src_conn.close()
+
+
+def _source_stamp(path: Path) -> tuple[int, ...]:
+    """(mtime_ns, size) of a SQLite DB and its WAL; changes whenever a write commits.
+
+    WAL-mode DBs (Safari) commit into the -wal file and only touch the main
+    file at checkpoint, so both are part of the stamp.
+    """
+    stamp: tuple[int, ...] = ()
+    for p in (path, path.with_name(path.name + "-wal")):
+        try:
+            st = p.stat()
+        except OSError:
+            stamp += (0, 0)
+        else:
+            stamp += (st.st_mtime_ns, st.st_size)
+    return stamp
+
+
+def _open_scratch(path: str) -> sqlite3.Connection:
+    """Connection to a private snapshot file that backups overwrite in place."""
+    # Used from whichever pool thread collects the source; never concurrently
+    conn = sqlite3.connect(path, check_same_thread=False)
+    # Nothing here needs to survive a crash: don't journal old pages or fsync
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-8192")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # Collectors only read; backup() still writes pages in under query_only
+    conn.execute("PRAGMA query_only=ON")
+    return conn
+
 
 class BrowserCollector(BaseCollector):
     name = "browser"
@@ -40,237 +100,247 @@ class BrowserCollector(BaseCollector):
 
     def setup(self) -> None:
         self._permission_warned: set[str] = set()
+        # (mtime_ns, size) of each Bookmarks file as of its last successful parse
+        self._bookmarks_stat: dict[Path, tuple[int, int]] = {}
+        # One scratch copy per source DB and a connection to it, both kept for
+        # the collector's lifetime; every cycle's backup overwrites the copy in place
+        self._snapshots: dict[Path, tuple[str, sqlite3.Connection]] = {}
+        # _source_stamp() of each source DB as of its last snapshot
+        self._source_stamps: dict[Path, tuple[int, ...]] = {}
+
+    def teardown(self) -> None:
+        for tmp, conn in self._snapshots.values():
+            conn.close()
+            Path(tmp).unlink(missing_ok=True)
+        self._snapshots.clear()
 
     def collect(self) -> None:
-        self._collect_chromium("chrome", config.CHROME_HISTORY)
-        self._collect_chromium("arc", config.ARC_HISTORY)
-        self._collect_safari()
-        self._collect_firefox()
-        self._collect_chromium_searches("chrome", config.CHROME_HISTORY)
-        self._collect_chromium_searches("arc", config.ARC_HISTORY)
-        self._collect_chromium_downloads("chrome", config.CHROME_HISTORY)
-        self._collect_chromium_downloads("arc", config.ARC_HISTORY)
-        self._collect_bookmarks("chrome", config.CHROME_BOOKMARKS)
-        self._collect_bookmarks("arc", config.ARC_BOOKMARKS)
-
-    def _collect_chromium(self, browser: str, db_path: Path) -> None:
-        """Collect from Chrome or Arc (same Chromium schema)."""
+        # Each source reads its own files and has its own watermark keys, so they
+        # run side by side; one failing source doesn't stop the others
+        sources = [
+            ("chrome", self._collect_chromium_all, ("chrome", config.CHROME_HISTORY)),
+            ("arc", self._collect_chromium_all, ("arc", config.ARC_HISTORY)),
+            ("safari", self._collect_safari, ()),
+            ("firefox", self._collect_firefox, ()),
+            ("chrome bookmarks", self._collect_bookmarks, ("chrome", config.CHROME_BOOKMARKS)),
+            ("arc bookmarks", self._collect_bookmarks, ("arc", config.ARC_BOOKMARKS)),
+        ]
+        with ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix="browser") as ex:
+            futures = {ex.submit(fn, *args): source for source, fn, args in sources}
+        for fut, source in futures.items():
+            try:
+                fut.result()
+            except Exception:
+                log.exception("[%s] %s collection failed", self.name, source)
+                # Re-read every source next cycle rather than skip the one that failed
+                self._source_stamps.clear()
+
+    def _collect_chromium_all(self, browser: str, db_path: Path) -> None:
+        """Copy a Chrome/Arc History DB once and run visits, searches and downloads on it."""
         if not db_path.exists():
             return
 
+        conn = self._copy_db(db_path)
+        if conn is None:
+            return
+
+        self._collect_chromium(browser, conn)
+        self._collect_chromium_searches(browser, conn)
+        self._collect_chromium_downloads(browser, conn)
+
+    def _collect_chromium(self, browser: str, conn: sqlite3.Connection) -> None:
+        """Collect visits from Chrome or Arc (same Chromium schema)."""
         watermark_key = f"{self.name}_{browser}"
         last_id = self.db.get_watermark(watermark_key)
 
-        tmp = self._copy_db(db_path)
-        if tmp is None:
+        # First run: skip historical data, just set watermark to current max
+        if last_id is None:
+            row = conn.execute("SELECT MAX(id) FROM visits").fetchone()
+            max_id = row[0] or 0
+            self.db.set_watermark(watermark_key, str(max_id), time.time())
+            log.info(
+                "[%s] first run — skipping %s history, tracking new visits only",
+                self.name, browser,
+            )
             return
 
-        try:
-            conn = sqlite3.connect(tmp)
-
-            # First run: skip historical data, just set watermark to current max
-            if last_id is None:
-                row = conn.execute("SELECT MAX(id) FROM visits").fetchone()
-                max_id = row[0] or 0
-                conn.close()
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info(
-                    "[%s] first run — skipping %s history, tracking new visits only",
-                    self.name, browser,
-                )
-                return
-
-            cur = conn.execute(
-                """SELECT v.id, u.url, u.title, v.visit_time, v.visit_duration
-                   FROM visits v JOIN urls u ON v.url = u.id
-                   WHERE v.id > ?
-                   ORDER BY v.id""",
-                (int(last_id),),
-            )
-            events = []
-            max_id = int(last_id)
-            for row in cur:
-                visit_id, url, title, visit_time, duration = row
-                ts = (visit_time - _CHROME_EPOCH_OFFSET) / 1_000_000
-                dur_s = duration / 1_000_000 if duration else 0
-                # Strip notification count prefix: "(3) Gmail" → "Gmail"
-                if title:
-                    title = _NOTIF_COUNT_RE.sub("", title)
-                events.append(Event(
-                    table="browser_events",
-                    columns=["timestamp", "url", "title", "browser", "visit_duration_s"],
-                    values=(ts, url, title, browser, dur_s),
+        cur = conn.execute(
+            f"""SELECT v.id, u.url, {_TITLE_SQL}, v.visit_time, v.visit_duration
+                FROM visits v JOIN urls u ON v.url = u.id
+                WHERE v.id > ?
+                ORDER BY v.id""",
+            (int(last_id),),
+        )
+        cur.arraysize = _FETCH_SIZE
+        count = 0
+        max_id = int(last_id)
+        # Bound once as locals for the per-row comprehension below
+        epoch, event, cols, push_many = (
+            _CHROME_EPOCH_OFFSET, Event, _BROWSER_COLS, self.buffer.push_many
+        )
+        # Push each fetched batch as it comes, so a long catch-up never holds
+        # more than one batch of events at a time
+        while rows := cur.fetchmany():
+            push_many([
+                # Positional: keyword parsing is a measurable share of Event() per row
+                event("browser_events", cols, (
+                    (visit_time - epoch) / 1_000_000, url, title, browser,
+                    duration / 1_000_000 if duration else 0,
                 ))
-                max_id = max(max_id, visit_id)
-            conn.close()
+                for _, url, title, visit_time, duration in rows
+            ])
+            count += len(rows)
+            # Rows are ORDER BY v.id, so the batch's last row holds its highest id
+            max_id = rows[-1][0]
 
-            if events:
-                self.buffer.push_many(events)
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info("[%s] collected %d visits from %s", self.name, len(events), browser)
-        finally:
-            Path(tmp).unlink(missing_ok=True)
+        if count:
+            self.db.set_watermark(watermark_key, str(max_id), time.time())
+            log.info("[%s] collected %d visits from %s", self.name, count, browser)
 
-    def _collect_chromium_searches(self, browser: str, db_path: Path) -> None:
+    def _collect_chromium_searches(self, browser: str, conn: sqlite3.Connection) -> None:
         """Collect search terms from Chrome/Arc keyword_search_terms table."""
-        if not db_path.exists():
-            return
-
         watermark_key = f"{self.name}_{browser}_search"
         last_url_id = self.db.get_watermark(watermark_key)
 
-        tmp = self._copy_db(db_path)
-        if tmp is None:
+        # Table may not exist in fresh profiles
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='keyword_search_terms'"
+        ).fetchone()
+        if not has_table:
             return
 
-        try:
-            conn = sqlite3.connect(tmp)
-
-            # Table may not exist in fresh profiles
-            has_table = conn.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='keyword_search_terms'"
-            ).fetchone()
-            if not has_table:
-                conn.close()
-                return
-
-            if last_url_id is None:
-                row = conn.execute("SELECT MAX(url_id) FROM keyword_search_terms").fetchone()
-                max_id = row[0] or 0
-                conn.close()
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info(
-                    "[%s] first run — skipping %s search terms, tracking new only",
-                    self.name, browser,
-                )
-                return
-
-            cur = conn.execute(
-                """SELECT k.url_id, k.term, u.url, v.visit_time
-                   FROM keyword_search_terms k
-                   JOIN urls u ON k.url_id = u.id
-                   LEFT JOIN visits v ON v.url = u.id
-                   WHERE k.url_id > ?
-                   GROUP BY k.url_id
-                   ORDER BY k.url_id""",
-                (int(last_url_id),),
+        if last_url_id is None:
+            row = conn.execute("SELECT MAX(url_id) FROM keyword_search_terms").fetchone()
+            max_id = row[0] or 0
+            self.db.set_watermark(watermark_key, str(max_id), time.time())
+            log.info(
+                "[%s] first run — skipping %s search terms, tracking new only",
+                self.name, browser,
             )
-            events = []
-            max_id = int(last_url_id)
-            for url_id, term, url, visit_time in cur:
-                if visit_time:
-                    ts = (visit_time - _CHROME_EPOCH_OFFSET) / 1_000_000
-                else:
-                    ts = time.time()
-                events.append(Event(
-                    table="search_events",
-                    columns=["timestamp", "term", "browser", "url"],
-                    values=(ts, term, browser, url),
-                ))
-                max_id = max(max_id, url_id)
-            conn.close()
-
-            if events:
-                self.buffer.push_many(events)
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info("[%s] collected %d search terms from %s", self.name, len(events), browser)
-        finally:
-            Path(tmp).unlink(missing_ok=True)
+            return
 
-    def _collect_chromium_downloads(self, browser: str, db_path: Path) -> None:
-        """Collect file downloads from Chrome/Arc downloads table."""
-        if not db_path.exists():
+        cur = conn.execute(
+            """SELECT k.url_id, k.term, u.url, v.visit_time
+               FROM keyword_search_terms k
+               JOIN urls u ON k.url_id = u.id
+               LEFT JOIN visits v ON v.url = u.id
+               WHERE k.url_id > ?
+               GROUP BY k.url_id
+               ORDER BY k.url_id""",
+            (int(last_url_id),),
+        )
+        rows = cur.fetchall()
+        if not rows:
             return
 
+        now = time.time()
+        events = [
+            Event(
+                "search_events", _SEARCH_COLS,
+                ((visit_time - _CHROME_EPOCH_OFFSET) / 1_000_000 if visit_time else now,
+                 term, browser, url),
+            )
+            for _, term, url, visit_time in rows
+        ]
+        self.buffer.push_many(events)
+        # ORDER BY k.url_id: the last row holds the new watermark
+        self.db.set_watermark(watermark_key, str(rows[-1][0]), now)
+        log.info("[%s] collected %d search terms from %s", self.name, len(events), browser)
+
+    def _collect_chromium_downloads(self, browser: str, conn: sqlite3.Connection) -> None:
+        """Collect file downloads from Chrome/Arc downloads table."""
         watermark_key = f"{self.name}_{browser}_downloads"
         last_id = self.db.get_watermark(watermark_key)
 
-        tmp = self._copy_db(db_path)
-        if tmp is None:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='downloads'"
+        ).fetchone()
+        if not has_table:
             return
 
-        try:
-            conn = sqlite3.connect(tmp)
-
-            has_table = conn.execute(
-                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='downloads'"
-            ).fetchone()
-            if not has_table:
-                conn.close()
-                return
-
-            if last_id is None:
-                row = conn.execute("SELECT MAX(id) FROM downloads").fetchone()
-                max_id = row[0] or 0
-                conn.close()
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info(
-                    "[%s] first run — skipping %s downloads, tracking new only",
-                    self.name, browser,
-                )
-                return
-
-            cur = conn.execute(
-                """SELECT id, target_path, tab_url, total_bytes,
-                          start_time, mime_type
-                   FROM downloads
-                   WHERE id > ?
-                   ORDER BY id""",
-                (int(last_id),),
+        if last_id is None:
+            row = conn.execute("SELECT MAX(id) FROM downloads").fetchone()
+            max_id = row[0] or 0
+            self.db.set_watermark(watermark_key, str(max_id), time.time())
+            log.info(
+                "[%s] first run — skipping %s downloads, tracking new only",
+                self.name, browser,
             )
-            events = []
-            max_id = int(last_id)
-            for row in cur:
-                dl_id, target_path, tab_url, total_bytes, start_time, mime_type = row
-                ts = (start_time - _CHROME_EPOCH_OFFSET) / 1_000_000
-                events.append(Event(
-                    table="download_events",
-                    columns=["timestamp", "file_path", "source_url",
-                             "total_bytes", "mime_type", "browser"],
-                    values=(ts, target_path, tab_url, total_bytes,
-                            mime_type, browser),
-                ))
-                max_id = max(max_id, dl_id)
-            conn.close()
+            return
 
-            if events:
-                self.buffer.push_many(events)
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info("[%s] collected %d downloads from %s", self.name, len(events), browser)
-        finally:
-            Path(tmp).unlink(missing_ok=True)
+        cur = conn.execute(
+            """SELECT id, target_path, tab_url, total_bytes,
+                      start_time, mime_type
+               FROM downloads
+               WHERE id > ?
+               ORDER BY id""",
+            (int(last_id),),
+        )
+        rows = cur.fetchall()
+        if not rows:
+            return
+
+        events = [
+            Event(
+                "download_events", _DOWNLOAD_COLS,
+                ((start_time - _CHROME_EPOCH_OFFSET) / 1_000_000, target_path, tab_url,
+                 total_bytes, mime_type, browser),
+            )
+            for _, target_path, tab_url, total_bytes, start_time, mime_type in rows
+        ]
+        self.buffer.push_many(events)
+        # ORDER BY id: the last row holds the new watermark
+        self.db.set_watermark(watermark_key, str(rows[-1][0]), time.time())
+        log.info("[%s] collected %d downloads from %s", self.name, len(events), browser)
 
     def _collect_bookmarks(self, browser: str, bookmarks_path: Path) -> None:
-        """Collect new bookmarks from Chrome/Arc Bookmarks JSON."""
-        if not bookmarks_path.exists():
+        """Collect new bookmarks from Chrome/Arc Bookmarks JSON.
+
+        The file only changes when a bookmark is added or removed, so it is
+        re-parsed only when its mtime or size differs from the last parse.
+        """
+        try:
+            st = bookmarks_path.stat()
+        except OSError:
+            return
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._bookmarks_stat.get(bookmarks_path) == stamp:
             return
 
         watermark_key = f"{self.name}_{browser}_bookmarks"
         last_date_added = self.db.get_watermark(watermark_key)
 
         try:
-            data = json.loads(bookmarks_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+            # json.loads takes the raw bytes and decodes them itself
+            data = json.loads(bookmarks_path.read_bytes())
+        except (OSError, ValueError):  # JSONDecodeError and UnicodeDecodeError
             return
+        self._bookmarks_stat[bookmarks_path] = stamp
 
-        # Walk the tree and collect all URL bookmarks
+        # Walk the tree depth-first and collect all URL bookmarks. An explicit
+        # stack avoids a Python frame per node; children are pushed reversed so
+        # bookmarks come out in file order.
         bookmarks: list[tuple[str, str, str, str]] = []  # (date_added, url, name, folder)
-
-        def walk(node: dict, folder: str = "") -> None:
-            if node.get("type") == "url":
-                bookmarks.append((
+        append = bookmarks.append
+        stack = [
+            (root, "") for root in reversed(data.get("roots", {}).values())
+            if isinstance(root, dict)
+        ]
+        while stack:
+            node, folder = stack.pop()
+            node_type = node.get("type")
+            if node_type == "url":
+                append((
                     node.get("date_added", "0"),
                     node.get("url", ""),
                     node.get("name", ""),
                     folder,
                 ))
-            for child in node.get("children", []):
-                child_folder = node.get("name", folder) if node.get("type") == "folder" else folder
-                walk(child, child_folder)
-
-        for root in data.get("roots", {}).values():
-            if isinstance(root, dict):
-                walk(root)
+            children = node.get("children")
+            if children:
+                if node_type == "folder":
+                    folder = node.get("name", folder)
+                stack.extend((child, folder) for child in reversed(children))
 
         if last_date_added is None:
             # First run: set watermark to max date_added
@@ -290,7 +360,7 @@ class BrowserCollector(BaseCollector):
             ts = (int(date_added) - _CHROME_EPOCH_OFFSET) / 1_000_000
             events.append(Event(
                 table="bookmark_events",
-                columns=["timestamp", "url", "title", "folder", "browser"],
+                columns=_BOOKMARK_COLS,
                 values=(ts, url, name, folder, browser),
             ))
             if date_added > max_date:
@@ -308,52 +378,45 @@ class BrowserCollector(BaseCollector):
         watermark_key = f"{self.name}_safari"
         last_ts_str = self.db.get_watermark(watermark_key)
 
-        tmp = self._copy_db(config.SAFARI_HISTORY)
-        if tmp is None:
+        conn = self._copy_db(config.SAFARI_HISTORY)
+        if conn is None:
             return
 
-        try:
-            conn = sqlite3.connect(tmp)
-
-            # First run: skip historical data
-            if last_ts_str is None:
-                row = conn.execute("SELECT MAX(visit_time) FROM history_visits").fetchone()
-                max_ts = row[0] or 0
-                conn.close()
-                self.db.set_watermark(watermark_key, str(max_ts), time.time())
-                log.info(
-                    "[%s] first run — skipping safari history, tracking new visits only",
-                    self.name,
-                )
-                return
-
-            last_ts = float(last_ts_str)
-            cur = conn.execute(
-                """SELECT hi.url, hv.title, hv.visit_time
-                   FROM history_visits hv
-                   JOIN history_items hi ON hv.history_item = hi.id
-                   WHERE hv.visit_time > ?
-                   ORDER BY hv.visit_time""",
-                (last_ts,),
+        # First run: skip historical data
+        if last_ts_str is None:
+            row = conn.execute("SELECT MAX(visit_time) FROM history_visits").fetchone()
+            max_ts = row[0] or 0
+            self.db.set_watermark(watermark_key, str(max_ts), time.time())
+            log.info(
+                "[%s] first run — skipping safari history, tracking new visits only",
+                self.name,
             )
-            events = []
-            max_ts = last_ts
-            for url, title, visit_time in cur:
-                ts = visit_time + _SAFARI_EPOCH_OFFSET
-                events.append(Event(
-                    table="browser_events",
-                    columns=["timestamp", "url", "title", "browser", "visit_duration_s"],
-                    values=(ts, url, title or "", "safari", 0),
-                ))
-                max_ts = max(max_ts, visit_time)
-            conn.close()
+            return
 
-            if events:
-                self.buffer.push_many(events)
-                self.db.set_watermark(watermark_key, str(max_ts), time.time())
-                log.info("[%s] collected %d visits from safari", self.name, len(events))
-        finally:
-            Path(tmp).unlink(missing_ok=True)
+        last_ts = float(last_ts_str)
+        cur = conn.execute(
+            """SELECT hi.url, hv.title, hv.visit_time
+               FROM history_visits hv
+               JOIN history_items hi ON hv.history_item = hi.id
+               WHERE hv.visit_time > ?
+               ORDER BY hv.visit_time""",
+            (last_ts,),
+        )
+        cur.arraysize = _FETCH_SIZE
+        count = 0
+        max_ts = last_ts
+        epoch, event, cols = _SAFARI_EPOCH_OFFSET, Event, _BROWSER_COLS
+        while rows := cur.fetchmany():
+            self.buffer.push_many([
+                event("browser_events", cols, (visit_time + epoch, url, title or "", "safari", 0))
+                for url, title, visit_time in rows
+            ])
+            count += len(rows)
+            max_ts = rows[-1][2]  # ORDER BY hv.visit_time: last row is the latest
+
+        if count:
+            self.db.set_watermark(watermark_key, str(max_ts), time.time())
+            log.info("[%s] collected %d visits from safari", self.name, count)
 
     def _collect_firefox(self) -> None:
         if not config.FIREFOX_PROFILES.exists():
@@ -369,65 +432,96 @@ class BrowserCollector(BaseCollector):
         watermark_key = f"{self.name}_firefox"
         last_id = self.db.get_watermark(watermark_key)
 
-        tmp = self._copy_db(places_db)
-        if tmp is None:
+        conn = self._copy_db(places_db)
+        if conn is None:
             return
 
-        try:
-            conn = sqlite3.connect(tmp)
-
-            # First run: skip historical data
-            if last_id is None:
-                row = conn.execute("SELECT MAX(id) FROM moz_historyvisits").fetchone()
-                max_id = row[0] or 0
-                conn.close()
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info(
-                    "[%s] first run — skipping firefox history, tracking new visits only",
-                    self.name,
-                )
-                return
-
-            cur = conn.execute(
-                """SELECT v.id, p.url, p.title, v.visit_date
-                   FROM moz_historyvisits v
-                   JOIN moz_places p ON v.place_id = p.id
-                   WHERE v.id > ?
-                   ORDER BY v.id""",
-                (int(last_id),),
+        # First run: skip historical data
+        if last_id is None:
+            row = conn.execute("SELECT MAX(id) FROM moz_historyvisits").fetchone()
+            max_id = row[0] or 0
+            self.db.set_watermark(watermark_key, str(max_id), time.time())
+            log.info(
+                "[%s] first run — skipping firefox history, tracking new visits only",
+                self.name,
             )
-            events = []
-            max_id = int(last_id)
-            for visit_id, url, title, visit_date in cur:
-                ts = visit_date / 1_000_000
-                events.append(Event(
-                    table="browser_events",
-                    columns=["timestamp", "url", "title", "browser", "visit_duration_s"],
-                    values=(ts, url, title or "", "firefox", 0),
-                ))
-                max_id = max(max_id, visit_id)
-            conn.close()
-
-            if events:
-                self.buffer.push_many(events)
-                self.db.set_watermark(watermark_key, str(max_id), time.time())
-                log.info("[%s] collected %d visits from firefox", self.name, len(events))
-        finally:
-            Path(tmp).unlink(missing_ok=True)
+            return
 
-    def _copy_db(self, src: Path) -> str | None:
-        """Copy a locked SQLite DB to a temp file for safe reading."""
-        try:
-            fd, tmp = tempfile.mkstemp(suffix=".db")
-            os.close(fd)
-            shutil.copy2(str(src), tmp)
-            return tmp
-        except PermissionError:
-            key = str(src)
-            if key not in self._permission_warned:
-                log.warning("%s needs Full Disk Access — skipping until granted", src)
-                self._permission_warned.add(key)
-            return None
-        except (OSError, shutil.Error):
-            log.exception("failed to copy db %s", src)
+        cur = conn.execute(
+            """SELECT v.id, p.url, p.title, v.visit_date
+               FROM moz_historyvisits v
+               JOIN moz_places p ON v.place_id = p.id
+               WHERE v.id > ?
+               ORDER BY v.id""",
+            (int(last_id),),
+        )
+        cur.arraysize = _FETCH_SIZE
+        count = 0
+        max_id = int(last_id)
+        event, cols = Event, _BROWSER_COLS
+        while rows := cur.fetchmany():
+            self.buffer.push_many([
+                event("browser_events", cols, (date / 1_000_000, url, title or "", "firefox", 0))
+                for _, url, title, date in rows
+            ])
+            count += len(rows)
+            max_id = rows[-1][0]  # ORDER BY v.id: last row has the highest id
+
+        if count:
+            self.db.set_watermark(watermark_key, str(max_id), time.time())
+            log.info("[%s] collected %d visits from firefox", self.name, count)
+
+    def _copy_db(self, src: Path) -> sqlite3.Connection | None:
+        """Snapshot a locked SQLite DB and return a connection to the snapshot.
+
+        Uses SQLite's online backup API so the snapshot is transactionally
+        consistent (including committed WAL frames). When the browser holds an
+        exclusive lock, falls back to reading the file as immutable — that read
+        takes no locks and ignores the WAL, so it can be torn by a concurrent
+        write, just like a raw file copy.
+
+        Each source keeps one temp file and one open connection to it for the
+        collector's lifetime (closed in teardown); the backup writes straight
+        through that connection. Cursors on it must be drained or dropped before
+        the next cycle, since a backup can't overwrite a DB that is mid-read.
+
+        Returns None when the source hasn't been written since its last
+        snapshot: there can't be new rows, so the copy and queries are skipped.
+        """
+        # Stamped before copying, so a write landing mid-backup is picked up next cycle
+        stamp = _source_stamp(src)
+        if self._source_stamps.get(src) == stamp:
             return None
+
+        snapshot = self._snapshots.get(src)
+        if snapshot is None:
+            try:
+                fd, tmp = tempfile.mkstemp(suffix=f"-{src.name}.db")
+                os.close(fd)
+            except OSError:
+                log.exception("failed to create temp copy for %s", src)
+                return None
+            snapshot = self._snapshots[src] = (tmp, _open_scratch(tmp))
+        conn = snapshot[1]
+
+        err: sqlite3.Error | None = None
+        for params in ("mode=ro", "mode=ro&immutable=1"):
+            try:
+                _backup(f"{src.as_uri()}?{params}", conn)
+                self._source_stamps[src] = stamp
+                return conn
+            except sqlite3.OperationalError as e:
+                err = e
+                # sqlite reports a Full Disk Access denial as "unable to open"
+                if "unable to open" in str(e):
+                    key = str(src)
+                    if key not in self._permission_warned:
+                        log.warning("%s needs Full Disk Access — skipping until granted", src)
+                        self._permission_warned.add(key)
+                    return None
+                # otherwise locked by the browser: retry as immutable
+            except sqlite3.Error as e:
+                err = e
+                break
+        log.error("failed to copy db %s: %s", src, err)
+        return None
@@ -28,6 +28,9 @@ _TRACKED_FIELDS = [
     "attendees", "is_all_day", "is_recurring",
 ]
 
+_HELPER_TIMEOUT = 20.0  # seconds to wait for the helper's output file
+_HELPER_POLL = 0.05
+
 
 def _fetch_events(helper_app: str) -> list[dict]:
     """Launch CalendarHelper.app and read events JSON from temp file."""
@@ -47,23 +50,31 @@ def _fetch_events(helper_app: str) -> list[dict]:
         log.warning("[calendar] helper launch failed: %s", result.stderr.strip())
         return []
 
-    # Wait for the helper to write the file (it runs async via `open`)
-    for _ in range(40):
-        time.sleep(0.5)
-        if os.path.exists(out_path) and os.path.getsize(out_path) > 2:
-            break
-    else:
-        log.warning("[calendar] helper timed out — no output file")
-        return []
+    # Wait for the helper to write the file (it runs async via `open`).
+    # The helper writes atomically, so the file existing means it's complete.
+    deadline = time.monotonic() + _HELPER_TIMEOUT
+    while not os.path.exists(out_path):
+        if time.monotonic() >= deadline:
+            log.warning("[calendar] helper timed out — no output file")
+            return []
+        time.sleep(_HELPER_POLL)
 
     try:
-        with open(out_path) as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
+        with open(out_path, "rb") as f:
+            return json.loads(f.read())
+    except (ValueError, OSError) as e:
         log.warning("[calendar] failed to parse output: %s", e)
         return []
 
 
+def _fetch_window(now: float) -> tuple[str, str]:
+    """ISO bounds of the helper's fetch window (-1 day to +7 days)."""
+    return (
+        time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now - 86400)),
+        time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now + 7 * 86400)),
+    )
+
+
 class CalendarCollector(BaseCollector):
     name = "calendar"
     interval = config.CALENDAR_INTERVAL
@@ -84,24 +95,34 @@ class CalendarCollector(BaseCollector):
             conn.commit()
 
     def _sync_events(self, conn, events: list[dict], now: float) -> None:
-        # Load all active events from DB
+        # Helper fetches from now-1day to now+7days; use ISO strings for comparison
+        window_min, window_max = _fetch_window(now)
+
+        # Load active events that this fetch can match or remove. Events that
+        # started before the window (multi-day ones) can still come back, so
+        # widen the range to cover every incoming start time.
+        starts = [ev["start"] for ev in events if ev.get("start")]
+        lo = min(window_min, *starts) if starts else window_min
+        hi = max(window_max, *starts) if starts else window_max
         cur = conn.execute(
             "SELECT id, event_uid, start_time, title, calendar_name, "
             "end_time, location, attendees, is_all_day, is_recurring "
-            "FROM calendar_events WHERE status = 'active'"
+            "FROM calendar_events "
+            "WHERE status = 'active' AND start_time BETWEEN ? AND ?",
+            (lo, hi),
         )
-        db_events = {}
-        for row in cur.fetchall():
-            key = (row[1], row[2])  # (event_uid, start_time)
-            db_events[key] = {
-                "id": row[0], "title": row[3], "calendar_name": row[4],
-                "end_time": row[5], "location": row[6], "attendees": row[7],
-                "is_all_day": row[8], "is_recurring": row[9],
-            }
+        # (event_uid, start_time) -> (id, tracked values in _TRACKED_FIELDS order)
+        db_events = {(row[1], row[2]): (row[0], row[3:]) for row in cur.fetchall()}
 
         seen_keys = set()
         added = 0
         modified = 0
+        # Writes are gathered here and issued as one executemany per statement
+        inserts: list[tuple] = []
+        updates: list[tuple] = []
+        touches: list[tuple] = []
+        # (timestamp, event_uid, title, change_type, field_name, old_value, new_value)
+        change_rows: list[tuple] = []
 
         for ev in events:
             uid = ev.get("uid", "")
@@ -111,114 +132,100 @@ class CalendarCollector(BaseCollector):
 
             key = (uid, start)
             seen_keys.add(key)
-            attendees = ", ".join(ev.get("attendees", []))
-
-            new_vals = {
-                "title": ev.get("title", ""),
-                "calendar_name": ev.get("calendar", ""),
-                "end_time": ev.get("end", ""),
-                "location": ev.get("location", ""),
-                "attendees": attendees,
-                "is_all_day": int(ev.get("all_day", False)),
-                "is_recurring": int(ev.get("recurring", False)),
-            }
-
-            if key not in db_events:
-                conn.execute(
-                    "INSERT OR IGNORE INTO calendar_events "
-                    "(timestamp, event_uid, title, calendar_name, start_time, "
-                    "end_time, location, attendees, is_all_day, is_recurring, "
-                    "first_seen, last_seen, status) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')",
-                    (now, uid, new_vals["title"], new_vals["calendar_name"],
-                     start, new_vals["end_time"], new_vals["location"],
-                     new_vals["attendees"], new_vals["is_all_day"],
-                     new_vals["is_recurring"], now, now),
-                )
-                conn.execute(
-                    "INSERT INTO calendar_changes "
-                    "(timestamp, event_uid, title, change_type) "
-                    "VALUES (?, ?, ?, 'added')",
-                    (now, uid, new_vals["title"]),
-                )
+            title = ev.get("title", "")
+
+            # Same order as _TRACKED_FIELDS
+            new_vals = (
+                title,
+                ev.get("calendar", ""),
+                ev.get("end", ""),
+                ev.get("location", ""),
+                ", ".join(ev.get("attendees", [])),
+                int(ev.get("all_day", False)),
+                int(ev.get("recurring", False)),
+            )
+
+            existing = db_events.get(key)
+            if existing is None:
+                inserts.append((now, uid, title, new_vals[1], start, *new_vals[2:], now, now))
+                change_rows.append((now, uid, title, "added", None, None, None))
                 added += 1
+                continue
+
+            event_id, old_vals = existing
+            # Unchanged events (the common case) are settled by one tuple compare
+            changes = [] if old_vals == new_vals else self._diff_fields(old_vals, new_vals)
+            if changes:
+                updates.append((*new_vals, now, event_id))
+                for field, old_v, new_v in changes:
+                    change_rows.append((now, uid, title, "modified", field, old_v, new_v))
+                modified += 1
             else:
-                existing = db_events[key]
-                changes = self._diff_fields(existing, new_vals)
-
-                if changes:
-                    conn.execute(
-                        "UPDATE calendar_events SET title=?, calendar_name=?, "
-                        "end_time=?, location=?, attendees=?, is_all_day=?, "
-                        "is_recurring=?, last_seen=? WHERE id=?",
-                        (new_vals["title"], new_vals["calendar_name"],
-                         new_vals["end_time"], new_vals["location"],
-                         new_vals["attendees"], new_vals["is_all_day"],
-                         new_vals["is_recurring"], now, existing["id"]),
-                    )
-                    for field, old_v, new_v in changes:
-                        conn.execute(
-                            "INSERT INTO calendar_changes "
-                            "(timestamp, event_uid, title, change_type, "
-                            "field_name, old_value, new_value) "
-                            "VALUES (?, ?, ?, 'modified', ?, ?, ?)",
-                            (now, uid, new_vals["title"], field, old_v, new_v),
-                        )
-                    modified += 1
-                else:
-                    conn.execute(
-                        "UPDATE calendar_events SET last_seen=? WHERE id=?",
-                        (now, existing["id"]),
-                    )
+                touches.append((now, event_id))
 
         # Detect removals — only within the fetch window
-        removed = self._mark_removals(conn, db_events, seen_keys, now)
+        removals = self._find_removals(db_events, seen_keys, window_min, window_max)
+        for event_id, uid, title in removals:
+            change_rows.append((now, uid, title, "removed", None, None, None))
+
+        if inserts:
+            conn.executemany(
+                "INSERT OR IGNORE INTO calendar_events "
+                "(timestamp, event_uid, title, calendar_name, start_time, "
+                "end_time, location, attendees, is_all_day, is_recurring, "
+                "first_seen, last_seen, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'active')",
+                inserts,
+            )
+        if updates:
+            conn.executemany(
+                "UPDATE calendar_events SET title=?, calendar_name=?, "
+                "end_time=?, location=?, attendees=?, is_all_day=?, "
+                "is_recurring=?, last_seen=? WHERE id=?",
+                updates,
+            )
+        if touches:
+            conn.executemany("UPDATE calendar_events SET last_seen=? WHERE id=?", touches)
+        if removals:
+            conn.executemany(
+                "UPDATE calendar_events SET status='removed', last_seen=? WHERE id=?",
+                [(now, event_id) for event_id, _, _ in removals],
+            )
+        if change_rows:
+            conn.executemany(
+                "INSERT INTO calendar_changes "
+                "(timestamp, event_uid, title, change_type, "
+                "field_name, old_value, new_value) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                change_rows,
+            )
 
+        removed = len(removals)
         if added or modified or removed:
             log.info(
                 "[%s] +%d added, ~%d modified, -%d removed (%d total fetched)",
                 self.name, added, modified, removed, len(events),
             )
 
-    def _diff_fields(self, existing: dict, new_vals: dict) -> list[tuple]:
+    def _diff_fields(self, old_vals: tuple, new_vals: tuple) -> list[tuple]:
         """Compare tracked fields, return list of (field, old_str, new_str)."""
         changes = []
-        for field in _TRACKED_FIELDS:
-            old_val = existing.get(field)
-            new_val = new_vals[field]
+        for field, old_val, new_val in zip(_TRACKED_FIELDS, old_vals, new_vals):
             if old_val is None:
                 old_val = "" if isinstance(new_val, str) else 0
             if old_val != new_val:
                 changes.append((field, str(old_val), str(new_val)))
         return changes
 
-    def _mark_removals(self, conn, db_events: dict, seen_keys: set,
-                       now: float) -> int:
-        """Mark active events as removed if they're within the helper's
-        fetch window (-1 day to +7 days) but weren't returned."""
-        # Helper fetches from now-1day to now+7days; use ISO strings for comparison
-        from datetime import datetime, timedelta, timezone
-        window_start = datetime.fromtimestamp(now, tz=timezone.utc) - timedelta(days=1)
-        window_end = datetime.fromtimestamp(now, tz=timezone.utc) + timedelta(days=7)
-        window_min = window_start.strftime("%Y-%m-%dT%H:%M:%S")
-        window_max = window_end.strftime("%Y-%m-%dT%H:%M:%S")
-
-        removed = 0
+    def _find_removals(self, db_events: dict, seen_keys: set, window_min: str,
+                       window_max: str) -> list[tuple[int, str, str]]:
+        """(id, event_uid, title) of active events within the helper's fetch
+        window (-1 day to +7 days) that weren't returned."""
+        removals = []
         for key, existing in db_events.items():
             if key in seen_keys:
                 continue
             # Only remove if start_time is within the fetch window
             if window_min <= key[1] <= window_max:
-                conn.execute(
-                    "UPDATE calendar_events SET status='removed', last_seen=? "
-                    "WHERE id=?",
-                    (now, existing["id"]),
-                )
-                conn.execute(
-                    "INSERT INTO calendar_changes "
-                    "(timestamp, event_uid, title, change_type) "
-                    "VALUES (?, ?, ?, 'removed')",
-                    (now, key[0], existing["title"]),
-                )
-                removed += 1
-        return removed
+                removals.append((existing[0], key[0], existing[1][0]))
+        return removals
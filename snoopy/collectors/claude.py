@@ -15,6 +15,8 @@ Each assistant message's content is a list of blocks:
 
 import json
 import logging
+import os
+from collections.abc import Iterator
 from pathlib import Path
 
 import snoopy.config as config
@@ -24,8 +26,14 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
+_CLAUDE_COLS = (
+    "timestamp", "session_id", "message_type", "content_preview", "project_path",
+)
 
-def parse_transcript(transcript_path: Path, since_offset: int = 0) -> tuple[list[dict], int]:
+
+def parse_transcript(
+    transcript_path: str | Path, since_offset: int = 0,
+) -> tuple[list[dict], int]:
     """Parse a Claude Code JSONL transcript into structured events.
 
     Delegates to Rust for the heavy lifting (JSONL parsing, regex, etc.).
@@ -38,6 +46,40 @@ def parse_transcript(transcript_path: Path, since_offset: int = 0) -> tuple[list
     return events, final_offset
 
 
+def transcript_events(parsed: list[dict]) -> list[Event]:
+    """claude_events rows for the dicts returned by parse_transcript."""
+    return [
+        Event("claude_events", _CLAUDE_COLS, (
+            ev["timestamp"], ev["session_id"], ev["message_type"],
+            ev["content_preview"], ev["project_path"],
+        ))
+        for ev in parsed
+    ]
+
+
+def _iter_transcripts(root: str) -> Iterator[tuple[str, os.stat_result]]:
+    """(path, stat) for every *.jsonl under root.
+
+    Walks with os.scandir so no Path objects are built and each file is
+    stat'ed once; like rglob, symlinked directories aren't descended into.
+    """
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".jsonl") and entry.is_file():
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue  # vanished between readdir and stat
+
+
 class ClaudeCollector(BaseCollector):
     """Polling-based fallback collector. The hook handles real-time capture.
 
@@ -48,13 +90,19 @@ class ClaudeCollector(BaseCollector):
     interval = config.CLAUDE_INTERVAL
 
     def setup(self) -> None:
-        self._file_state: dict[str, tuple[float, int]] = {}
-        saved = self.get_watermark()
-        if saved:
-            try:
-                self._file_state = json.loads(saved)
-            except (json.JSONDecodeError, TypeError):
-                pass
+        self._file_state = self.db.get_claude_file_state()
+        if not self._file_state:
+            # Older versions kept the whole map as a JSON watermark: carry it over once
+            saved = self.get_watermark()
+            if saved:
+                try:
+                    legacy = json.loads(saved)
+                except (json.JSONDecodeError, TypeError):
+                    legacy = {}
+                self._file_state = {p: (m, o) for p, (m, o) in legacy.items()}
+                self.db.set_claude_file_state(
+                    [(p, m, o) for p, (m, o) in self._file_state.items()]
+                )
         self._initialized = bool(self._file_state)
 
     def collect(self) -> None:
@@ -64,11 +112,12 @@ class ClaudeCollector(BaseCollector):
 
         # First run: record current file positions without importing history
         if not self._initialized:
-            for jsonl_path in projects_dir.rglob("*.jsonl"):
-                str_path = str(jsonl_path)
-                stat = jsonl_path.stat()
-                self._file_state[str_path] = (stat.st_mtime, stat.st_size)
-            self.set_watermark(json.dumps(self._file_state))
+            rows = [
+                (str_path, stat.st_mtime, stat.st_size)
+                for str_path, stat in _iter_transcripts(str(projects_dir))
+            ]
+            self._file_state.update((p, (m, o)) for p, m, o in rows)
+            self.db.set_claude_file_state(rows)
             self._initialized = True
             log.info(
                 "[%s] first run — indexed %d transcript files, tracking new events only",
@@ -77,32 +126,25 @@ class ClaudeCollector(BaseCollector):
             return
 
         all_events = []
-        for jsonl_path in projects_dir.rglob("*.jsonl"):
-            str_path = str(jsonl_path)
-            current_mtime = jsonl_path.stat().st_mtime
+        # Only transcripts read this cycle are written back, not the whole map
+        dirty: list[tuple[str, float, int]] = []
+        for str_path, stat in _iter_transcripts(str(projects_dir)):
+            current_mtime = stat.st_mtime
             prev_mtime, prev_offset = self._file_state.get(str_path, (0.0, 0))
 
-            if current_mtime <= prev_mtime:
+            # An mtime bump with nothing appended needs no open()+seek()
+            if current_mtime <= prev_mtime or stat.st_size == prev_offset:
                 continue
+            if stat.st_size < prev_offset:
+                prev_offset = 0  # truncated or rewritten: read it again from the top
 
-            parsed, new_offset = parse_transcript(jsonl_path, since_offset=prev_offset)
+            parsed, new_offset = parse_transcript(str_path, since_offset=prev_offset)
             self._file_state[str_path] = (current_mtime, new_offset)
+            dirty.append((str_path, current_mtime, new_offset))
 
-            for ev in parsed:
-                cols = [
-                    "timestamp", "session_id", "message_type",
-                    "content_preview", "project_path",
-                ]
-                vals = (
-                    ev["timestamp"], ev["session_id"],
-                    ev["message_type"], ev["content_preview"],
-                    ev["project_path"],
-                )
-                all_events.append(Event(
-                    table="claude_events", columns=cols, values=vals,
-                ))
+            all_events += transcript_events(parsed)
 
         if all_events:
             self.buffer.push_many(all_events)
-            self.set_watermark(json.dumps(self._file_state))
             log.info("[%s] collected %d events", self.name, len(all_events))
+        self.db.set_claude_file_state(dirty)
@@ -17,13 +17,13 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
-# URLs containing auth tokens, secrets, or login credentials
-_SENSITIVE_URL_RE = re.compile(
-    r"https?://\S*(?:token=|api_key=|secret=|password=|login/one-time)", re.IGNORECASE
-)
-# Standalone tokens/secrets (GitHub PATs, API keys, Slack tokens, etc.)
-_SENSITIVE_TOKEN_RE = re.compile(
-    r"^(?:ghp_|gho_|github_pat_|sk-[a-zA-Z0-9]{20}|xox[bpas]-|AKIA[0-9A-Z]{16})"
+# Content carrying auth tokens or secrets, checked in one search:
+#   - URLs with tokens, secrets or login credentials in them (any case)
+#   - standalone tokens/secrets (GitHub PATs, API keys, Slack tokens, etc.)
+#     at the start of the text, after leading whitespace
+_SENSITIVE_RE = re.compile(
+    r"(?i:https?://\S*(?:token=|api_key=|secret=|password=|login/one-time))"
+    r"|\A\s*(?:ghp_|gho_|github_pat_|sk-[a-zA-Z0-9]{20}|xox[bpas]-|AKIA[0-9A-Z]{16})"
 )
 
 
@@ -33,6 +33,7 @@ class ClipboardCollector(BaseCollector):
 
     def setup(self) -> None:
         self._pasteboard = NSPasteboard.generalPasteboard()
+        self._workspace = NSWorkspace.sharedWorkspace()
         self._last_change_count = self._pasteboard.changeCount()
 
     def collect(self) -> None:
@@ -52,7 +53,7 @@ class ClipboardCollector(BaseCollector):
             return
 
         # Skip clipboard content containing auth tokens or secrets
-        if _SENSITIVE_URL_RE.search(text) or _SENSITIVE_TOKEN_RE.match(text.strip()):
+        if _SENSITIVE_RE.search(text):
             log.debug("skipping clipboard with sensitive content")
             return
 
@@ -66,10 +67,8 @@ class ClipboardCollector(BaseCollector):
             values=(time.time(), text, "text/plain", source_app),
         ))
 
-    @staticmethod
-    def _get_frontmost_app() -> str:
-        workspace = NSWorkspace.sharedWorkspace()
-        active = workspace.activeApplication()
+    def _get_frontmost_app(self) -> str:
+        active = self._workspace.activeApplication()
         if active:
             return active.get("NSApplicationName", "")
         return ""
@@ -18,6 +18,8 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
+_DOCK_COLS = ("timestamp", "event_type", "app_name", "badge_value", "prev_badge_value")
+
 
 def _fetch_dock_items() -> list[dict] | None:
     """Run the dock_helper Swift binary and parse its JSON output."""
@@ -43,7 +45,7 @@ class DockCollector(BaseCollector):
     interval = config.DOCK_INTERVAL
 
     def setup(self) -> None:
-        self._prev: dict[str, dict] = {}
+        self._prev: dict[str, tuple[str, bool]] = {}  # app -> (badge, running)
         self._first_run = True
 
     def collect(self) -> None:
@@ -54,56 +56,53 @@ class DockCollector(BaseCollector):
         current = {}
         for item in items:
             app = item.get("app", "")
-            if not app:
-                continue
-            current[app] = {
-                "badge": item.get("badge", ""),
-                "running": item.get("running", False),
-            }
+            if app:
+                current[app] = (item.get("badge", ""), item.get("running", False))
 
         if self._first_run:
             self._prev = current
             self._first_run = False
             return
 
+        # Most polls see the exact same dock: one dict compare settles it
+        if current == self._prev:
+            return
+
         now = time.time()
 
         for app, state in current.items():
             prev_state = self._prev.get(app)
+            if prev_state == state:
+                continue
+            badge, running = state
 
             if prev_state is None:
                 # New app appeared in dock — treat as if it just started
-                if state["running"]:
+                if running:
                     self._emit(now, "app_active", app)
-                if state["badge"]:
-                    self._emit(now, "badge_change", app, badge=state["badge"], prev_badge="")
+                if badge:
+                    self._emit(now, "badge_change", app, badge=badge, prev_badge="")
                 continue
 
+            prev_badge, prev_running = prev_state
+
             # Badge changed
-            if state["badge"] != prev_state["badge"]:
-                self._emit(
-                    now, "badge_change", app,
-                    badge=state["badge"],
-                    prev_badge=prev_state["badge"],
-                )
+            if badge != prev_badge:
+                self._emit(now, "badge_change", app, badge=badge, prev_badge=prev_badge)
 
             # Running state changed
-            if state["running"] and not prev_state["running"]:
+            if running and not prev_running:
                 self._emit(now, "app_active", app)
-            elif not state["running"] and prev_state["running"]:
+            elif not running and prev_running:
                 self._emit(now, "app_inactive", app)
 
         # Apps that disappeared from dock
-        for app, prev_state in self._prev.items():
-            if app not in current and prev_state["running"]:
+        for app, (_, prev_running) in self._prev.items():
+            if prev_running and app not in current:
                 self._emit(now, "app_inactive", app)
 
         self._prev = current
 
     def _emit(self, ts: float, event_type: str, app: str,
               badge: str = "", prev_badge: str = "") -> None:
-        self.buffer.push(Event(
-            table="dock_events",
-            columns=["timestamp", "event_type", "app_name", "badge_value", "prev_badge_value"],
-            values=(ts, event_type, app, badge, prev_badge),
-        ))
+        self.buffer.push(Event("dock_events", _DOCK_COLS, (ts, event_type, app, badge, prev_badge)))
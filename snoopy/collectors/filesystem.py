@@ -6,8 +6,10 @@ Debounces rapid events on the same path.
 """
 
 import logging
+import re
 import threading
 import time
+from collections import OrderedDict
 
 import FSEvents
 
@@ -17,13 +19,56 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
+_FILE_COLS = ("timestamp", "event_type", "file_path", "directory")
+
+# Event types in priority order: an event carrying several flags gets the first
+_FLAG_TYPES = (
+    (FSEvents.kFSEventStreamEventFlagItemCreated, "created"),
+    (FSEvents.kFSEventStreamEventFlagItemRemoved, "removed"),
+    (FSEvents.kFSEventStreamEventFlagItemRenamed, "renamed"),
+    (FSEvents.kFSEventStreamEventFlagItemModified, "modified"),
+)
+_FLAG_MASK = sum(flag for flag, _ in _FLAG_TYPES)
+
+
+def _flag_labels() -> dict[int, str]:
+    """Event type for every combination of the _FLAG_TYPES bits."""
+    labels = {}
+    for n in range(1 << len(_FLAG_TYPES)):
+        bits = sum(flag for i, (flag, _) in enumerate(_FLAG_TYPES) if n >> i & 1)
+        labels[bits] = next((label for flag, label in _FLAG_TYPES if bits & flag), "unknown")
+    return labels
+
+
+_FLAG_LABELS = _flag_labels()
+
+
+def _compile_excluded(patterns) -> re.Pattern | None:
+    """One regex matching any of the substrings in patterns, or None if empty.
+
+    Alternatives are grouped by first character ("/(?:.git/objects/|...)") so
+    the engine tries a single branch at each position instead of every pattern.
+    """
+    by_first: dict[str, list[str]] = {}
+    for pat in dict.fromkeys(patterns):
+        if pat:
+            by_first.setdefault(pat[0], []).append(re.escape(pat[1:]))
+    if not by_first:
+        return None
+    return re.compile("|".join(
+        f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in by_first.items()
+    ))
+
 
 class FilesystemCollector(BaseCollector):
     name = "filesystem"
     interval = 0  # Push-based via FSEvents callback
 
     def setup(self) -> None:
-        self._last_events: dict[str, float] = {}  # path -> timestamp for debounce
+        # path -> timestamp for debounce, oldest first; entries are dropped once
+        # they're older than the debounce window, so this only holds recent paths
+        self._last_events: OrderedDict[str, float] = OrderedDict()
+        self._excluded_re = _compile_excluded(config.FS_EXCLUDED_PATTERNS)
         self._stream = None
         self._thread: threading.Thread | None = None
 
@@ -64,33 +109,41 @@ class FilesystemCollector(BaseCollector):
 
         def callback(stream_ref, client_info, num_events, event_paths, event_flags, event_ids):
             now = time.time()
+            last_events = self._last_events
+            excluded = self._excluded_re
+            classify, event = self._classify_flags, Event
+            # One push_many per callback, so the buffer lock is taken once per batch
+            events: list[Event] = []
+            append = events.append
+            # Expire paths whose debounce window has passed
+            while last_events:
+                oldest = next(iter(last_events))
+                if now - last_events[oldest] < config.FS_DEBOUNCE_SECONDS:
+                    break
+                last_events.popitem(last=False)
+
             for i in range(num_events):
                 path = event_paths[i]
                 # Debounce: skip if we saw this path recently
-                last_seen = self._last_events.get(path, 0)
-                if now - last_seen < config.FS_DEBOUNCE_SECONDS:
+                if path in last_events:
                     continue
-                self._last_events[path] = now
+                last_events[path] = now
 
                 path_str = (
                     path.decode("utf-8", errors="replace")
                     if isinstance(path, bytes) else str(path)
                 )
 
-                if any(pat in path_str for pat in config.FS_EXCLUDED_PATTERNS):
+                if excluded is not None and excluded.search(path_str):
                     continue
 
-                flags = event_flags[i]
-                event_type = self._classify_flags(flags)
+                # rpartition gives "" when there's no "/", like the old rsplit guard
+                append(event("file_events", _FILE_COLS, (
+                    now, classify(event_flags[i]), path_str, path_str.rpartition("/")[0],
+                )))
 
-                self.buffer.push(Event(
-                    table="file_events",
-                    columns=["timestamp", "event_type", "file_path", "directory"],
-                    values=(
-                        now, event_type, path_str,
-                        path_str.rsplit("/", 1)[0] if "/" in path_str else "",
-                    ),
-                ))
+            if events:
+                self.buffer.push_many(events)
 
         self._stream = FSEvents.FSEventStreamCreate(
             None,               # allocator
@@ -118,12 +171,4 @@ class FilesystemCollector(BaseCollector):
     @staticmethod
     def _classify_flags(flags: int) -> str:
         """Map FSEvent flags to a human-readable event type."""
-        if flags & FSEvents.kFSEventStreamEventFlagItemCreated:
-            return "created"
-        if flags & FSEvents.kFSEventStreamEventFlagItemRemoved:
-            return "removed"
-        if flags & FSEvents.kFSEventStreamEventFlagItemRenamed:
-            return "renamed"
-        if flags & FSEvents.kFSEventStreamEventFlagItemModified:
-            return "modified"
-        return "unknown"
+        return _FLAG_LABELS[flags & _FLAG_MASK]
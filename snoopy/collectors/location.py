@@ -47,21 +47,20 @@ class LocationCollector(BaseCollector):
             log.debug("CoreLocationCLI failed: %s", e)
             return
 
-        if result.returncode != 0 or not result.stdout.strip():
+        if result.returncode != 0:
             return
 
-        line = result.stdout.strip().replace("\n", ", ")
-        parts = line.split(_SEP)
+        # Split the raw output: only the address spans several lines
+        parts = result.stdout.split(_SEP, 7)
         if len(parts) < 8:
             return
 
         try:
-            lat, lng = float(parts[0]), float(parts[1])
-            alt, acc = float(parts[2]), float(parts[3])
+            lat, lng, alt, acc = map(float, parts[:4])
         except ValueError:
             return
 
-        address = parts[4].strip() or None
+        address = parts[4].strip().replace("\n", ", ") or None
         locality = parts[5].strip() or None
         admin_area = parts[6].strip() or None
         country = parts[7].strip() or None
@@ -1,17 +1,15 @@
 """Apple Mail collector — tracks emails via Envelope Index.
 
 Reads from ~/Library/Mail/V*/MailData/Envelope Index (requires Full Disk Access).
-Copy-before-read to avoid locking issues with Mail.app.
+Opened read-only in place: Mail keeps the index in WAL mode, so a reader
+neither blocks Mail.app nor sees its uncommitted writes.
 
 First run: seeds with the last N days of emails (configurable via MAIL_SEED_DAYS).
 Subsequent runs: incremental via ROWID watermark.
 """
 
 import logging
-import os
-import shutil
 import sqlite3
-import tempfile
 import time
 from pathlib import Path
 from urllib.parse import unquote
@@ -24,6 +22,17 @@ log = logging.getLogger(__name__)
 
 _MAIL_BASE = Path("~/Library/Mail").expanduser()
 _CONTENT_PREVIEW_LEN = 100_000
+_MAIL_COLS = (
+    "timestamp", "message_id", "mailbox", "sender", "subject",
+    "content_preview", "is_from_me", "read", "deleted", "flagged",
+)
+# Rows pulled per fetchmany(); bounds memory on a large first-run seed
+_FETCH_SIZE = 1024
+
+# mailbox ROWID -> (mailbox name, is_from_me)
+_MailboxMap = dict[int, tuple[str, int]]
+# mailbox_map entry for messages whose mailbox row is missing
+_NO_MAILBOX = ("", 0)
 
 _QUERY_COLUMNS = """
     m.ROWID, m.date_received, m.read, m.deleted, m.flagged,
@@ -56,20 +65,21 @@ def _find_envelope_index() -> Path | None:
     return None
 
 
-def _copy_mail_db(src: Path) -> str | None:
-    """Copy Envelope Index + WAL/SHM to a temp file. Returns temp path or None."""
-    fd, tmp = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
+def _open_index(path: Path) -> sqlite3.Connection:
+    """Read-only connection to the live Envelope Index.
+
+    Raises sqlite3.OperationalError if it can't be read, which is how a
+    missing Full Disk Access grant shows up.
+    """
+    conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
     try:
-        shutil.copy2(str(src), tmp)
-        for suffix in ("-wal", "-shm"):
-            wal = str(src) + suffix
-            if os.path.exists(wal):
-                shutil.copy2(wal, tmp + suffix)
-        return tmp
-    except (OSError, shutil.Error):
-        Path(tmp).unlink(missing_ok=True)
-        return None
+        # connect() is lazy: touch the schema so a denied open fails here
+        conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        conn.execute("PRAGMA cache_size=-8192")
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
 
 
 def _mailbox_name_from_url(url: str | None) -> str:
@@ -99,28 +109,29 @@ class MailCollector(BaseCollector):
         if saved is not None:
             self._last_id = int(saved)
         self._permission_warned = False
+        # The index is located once and kept open across polls, so its page cache
+        # stays warm. Both are dropped whenever it can't be read or the file is
+        # replaced (e.g. Mail migrated it to a new V* directory), forcing a rescan.
+        self._idx_path: Path | None = None
+        self._idx_ino = 0
+        self._conn: sqlite3.Connection | None = None
 
-    def collect(self) -> None:
-        idx_path = _find_envelope_index()
-        if idx_path is None:
-            log.debug("Envelope Index not found — Mail may not be set up")
-            return
+    def teardown(self) -> None:
+        self._close_index()
 
-        tmp = _copy_mail_db(idx_path)
-        if tmp is None:
-            if not self._permission_warned:
-                log.warning("Mail Envelope Index needs Full Disk Access — skipping until granted")
-                self._permission_warned = True
+    def collect(self) -> None:
+        conn = self._index_conn()
+        if conn is None:
             return
 
         try:
-            conn = sqlite3.connect(tmp)
-
-            # Build mailbox ROWID -> name map
+            # Build mailbox ROWID -> (name, is_sent) map, so each message row
+            # costs one dict lookup rather than a URL parse and name check
             mailbox_map = {}
             try:
                 for rowid, url in conn.execute("SELECT ROWID, url FROM mailboxes"):
-                    mailbox_map[rowid] = _mailbox_name_from_url(url)
+                    name = _mailbox_name_from_url(url)
+                    mailbox_map[rowid] = (name, _is_sent(name))
             except sqlite3.OperationalError:
                 pass
 
@@ -128,14 +139,46 @@ class MailCollector(BaseCollector):
                 self._first_run(conn, mailbox_map)
             else:
                 self._incremental(conn, mailbox_map)
-
-            conn.close()
         except sqlite3.OperationalError:
+            self._close_index()
             log.warning("Mail DB query failed (schema may differ on this macOS version)")
-        finally:
-            Path(tmp).unlink(missing_ok=True)
 
-    def _first_run(self, conn: sqlite3.Connection, mailbox_map: dict[int, str]) -> None:
+    def _index_conn(self) -> sqlite3.Connection | None:
+        """The open Envelope Index connection, (re)opening it when needed."""
+        if self._conn is not None:
+            # An open connection keeps reading a file that was deleted or
+            # replaced, so check it's still the one at the path
+            try:
+                if self._idx_path and self._idx_path.stat().st_ino == self._idx_ino:
+                    return self._conn
+            except OSError:
+                pass
+            self._close_index()
+
+        if self._idx_path is None:
+            self._idx_path = _find_envelope_index()
+            if self._idx_path is None:
+                log.debug("Envelope Index not found — Mail may not be set up")
+                return None
+
+        try:
+            self._idx_ino = self._idx_path.stat().st_ino
+            self._conn = _open_index(self._idx_path)
+        except (OSError, sqlite3.OperationalError):
+            self._idx_path = None
+            if not self._permission_warned:
+                log.warning("Mail Envelope Index needs Full Disk Access — skipping until granted")
+                self._permission_warned = True
+            return None
+        return self._conn
+
+    def _close_index(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._idx_path = None
+
+    def _first_run(self, conn: sqlite3.Connection, mailbox_map: _MailboxMap) -> None:
         """Seed with last MAIL_SEED_DAYS of emails, then set watermark to MAX(ROWID)."""
         cutoff = time.time() - (config.MAIL_SEED_DAYS * 86400)
 
@@ -143,68 +186,52 @@ class MailCollector(BaseCollector):
             f"SELECT {_QUERY_COLUMNS} {_QUERY_JOINS} WHERE m.date_received >= ? ORDER BY m.ROWID",
             (cutoff,),
         )
-
-        events = self._rows_to_events(cur, mailbox_map)
+        count, _ = self._push_rows(cur, mailbox_map)
 
         # Always set watermark to MAX(ROWID) — even if no recent messages
         row = conn.execute("SELECT MAX(ROWID) FROM messages").fetchone()
         max_id = row[0] or 0
 
-        if events:
-            self.buffer.push_many(events)
-
         self._last_id = max_id
         self.set_watermark(str(max_id))
         log.info(
             "[%s] first run — seeded %d messages from last %d day(s)",
-            self.name, len(events), config.MAIL_SEED_DAYS,
+            self.name, count, config.MAIL_SEED_DAYS,
         )
 
-    def _incremental(self, conn: sqlite3.Connection, mailbox_map: dict[int, str]) -> None:
+    def _incremental(self, conn: sqlite3.Connection, mailbox_map: _MailboxMap) -> None:
         """Fetch messages with ROWID > watermark."""
         cur = conn.execute(
             f"SELECT {_QUERY_COLUMNS} {_QUERY_JOINS} WHERE m.ROWID > ? ORDER BY m.ROWID",
             (self._last_id,),
         )
+        count, max_id = self._push_rows(cur, mailbox_map)
 
-        events = []
-        assert self._last_id is not None
-        max_id = self._last_id
-        for rowid, date_received, read, deleted, flagged, mailbox_id, subject, sender in cur:
-            ts = date_received if date_received else time.time()
-            mailbox_name = mailbox_map.get(mailbox_id, "")
-            is_from_me = _is_sent(mailbox_name)
-            content_preview = (subject or "")[:_CONTENT_PREVIEW_LEN]
-
-            events.append(Event(
-                table="mail_events",
-                columns=["timestamp", "message_id", "mailbox", "sender", "subject",
-                         "content_preview", "is_from_me", "read", "deleted", "flagged"],
-                values=(ts, rowid, mailbox_name, sender or "", subject or "",
-                        content_preview, is_from_me, read or 0, deleted or 0, flagged or 0),
-            ))
-            max_id = max(max_id, rowid)
-
-        if events:
-            self.buffer.push_many(events)
+        if count:
             self._last_id = max_id
             self.set_watermark(str(max_id))
-            log.info("[%s] collected %d new messages", self.name, len(events))
-
-    def _rows_to_events(self, cur: sqlite3.Cursor, mailbox_map: dict[int, str]) -> list[Event]:
-        """Convert query rows to Event objects."""
-        events = []
-        for rowid, date_received, read, deleted, flagged, mailbox_id, subject, sender in cur:
-            ts = date_received if date_received else time.time()
-            mailbox_name = mailbox_map.get(mailbox_id, "")
-            is_from_me = _is_sent(mailbox_name)
-            content_preview = (subject or "")[:_CONTENT_PREVIEW_LEN]
-
-            events.append(Event(
-                table="mail_events",
-                columns=["timestamp", "message_id", "mailbox", "sender", "subject",
-                         "content_preview", "is_from_me", "read", "deleted", "flagged"],
-                values=(ts, rowid, mailbox_name, sender or "", subject or "",
-                        content_preview, is_from_me, read or 0, deleted or 0, flagged or 0),
-            ))
-        return events
+            log.info("[%s] collected %d new messages", self.name, count)
+
+    def _push_rows(self, cur: sqlite3.Cursor, mailbox_map: _MailboxMap) -> tuple[int, int]:
+        """Push query rows to the buffer a batch at a time.
+
+        Returns (rows pushed, ROWID of the last row); rows are ordered by ROWID.
+        """
+        cur.arraysize = _FETCH_SIZE
+        count = last_id = 0
+        event, cols, push_many = Event, _MAIL_COLS, self.buffer.push_many
+        while rows := cur.fetchmany():
+            events = []
+            for rowid, date_received, read, deleted, flagged, mailbox_id, subject, sender in rows:
+                ts = date_received if date_received else time.time()
+                mailbox_name, is_from_me = mailbox_map.get(mailbox_id, _NO_MAILBOX)
+                subject = subject or ""
+                events.append(event("mail_events", cols, (
+                    ts, rowid, mailbox_name, sender or "", subject,
+                    subject[:_CONTENT_PREVIEW_LEN], is_from_me,
+                    read or 0, deleted or 0, flagged or 0,
+                )))
+            push_many(events)
+            count += len(rows)
+            last_id = rows[-1][0]
+        return count, last_id
@@ -5,6 +5,7 @@ Requires: brew install nowplaying-cli
 """
 
 import logging
+import shutil
 import subprocess
 import time
 
@@ -14,6 +15,8 @@ from snoopy.collectors.base import BaseCollector
 
 log = logging.getLogger(__name__)
 
+_CLI = shutil.which("nowplaying-cli")
+
 
 class MediaCollector(BaseCollector):
     name = "media"
@@ -21,6 +24,8 @@ class MediaCollector(BaseCollector):
 
     def setup(self) -> None:
         self._last_key: str | None = None
+        if not _CLI:
+            log.warning("nowplaying-cli not found — install with: brew install nowplaying-cli")
 
     def collect(self) -> None:
         info = self._get_now_playing()
@@ -48,18 +53,17 @@ class MediaCollector(BaseCollector):
     @staticmethod
     def _get_now_playing() -> dict | None:
         """Run nowplaying-cli and parse its output."""
+        if not _CLI:
+            return None
         try:
             result = subprocess.run(
                 [
-                    "nowplaying-cli", "get", "title", "artist",
+                    _CLI, "get", "title", "artist",
                     "album", "playbackRate", "clientPropertiesDeviceName",
                 ],
                 capture_output=True, text=True, timeout=3,
             )
-        except FileNotFoundError:
-            log.debug("nowplaying-cli not found")
-            return None
-        except subprocess.TimeoutExpired:
+        except (subprocess.TimeoutExpired, OSError):
             return None
 
         if result.returncode != 0:
@@ -43,7 +43,10 @@ FILESYSTEM_INTERVAL = 0  # FSEvents is push-based, 0 = no polling
 LOCATION_INTERVAL = 300  # 5 minutes
 NOTIFICATION_INTERVAL = 30
 MESSAGES_INTERVAL = 15
-BATTERY_INTERVAL = 300  # 5 minutes
+BATTERY_INTERVAL = 300  # 5 minutes — until enough changes are seen to adapt
+BATTERY_MIN_INTERVAL = 30     # adaptive poll bounds: adapting only ever polls faster,
+BATTERY_MAX_INTERVAL = BATTERY_INTERVAL  # so an unplug is still seen within 5 minutes
+BATTERY_ADAPT_MIN_SAMPLES = 4  # inter-change gaps needed before adapting
 SYSTEM_INTERVAL = 5     # sleep/wake detection + lock state polling
 APPLIFECYCLE_INTERVAL = 10  # poll running apps for launches/quits
 CALENDAR_INTERVAL = 1800    # 30 minutes
@@ -12,6 +12,7 @@ Production hardening:
 import logging
 import sqlite3
 import threading
+from collections.abc import Sequence
 from pathlib import Path
 
 from snoopy.config import DB_PATH
@@ -31,7 +32,7 @@ _VALID_TABLES = frozenset({
     "calendar_changes", "oura_daily", "mail_events", "note_events",
     "reminder_events", "zoom_events", "slack_events",
     "whatsapp_events", "page_content_events", "dock_events",
-    "collector_state", "daemon_health",
+    "collector_state", "claude_file_state", "daemon_health",
 })
 
 _SCHEMA = """
@@ -258,6 +259,7 @@ CREATE TABLE IF NOT EXISTS calendar_events (
 );
 CREATE INDEX IF NOT EXISTS idx_calendar_ts ON calendar_events(timestamp);
 CREATE INDEX IF NOT EXISTS idx_calendar_status ON calendar_events(status);
+CREATE INDEX IF NOT EXISTS idx_calendar_active ON calendar_events(status, start_time);
 
 CREATE TABLE IF NOT EXISTS calendar_changes (
     id INTEGER PRIMARY KEY,
@@ -401,6 +403,13 @@ CREATE TABLE IF NOT EXISTS collector_state (
     last_run_timestamp REAL
 );
 
+-- Per-transcript read position for the Claude polling collector
+CREATE TABLE IF NOT EXISTS claude_file_state (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    offset INTEGER NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS daemon_health (
     id INTEGER PRIMARY KEY,
     timestamp REAL NOT NULL,
@@ -499,7 +508,7 @@ class Database:
 
     # ── writes ──────────────────────────────────────────────────────────
 
-    def batch_insert(self, table: str, columns: list[str], rows: list[tuple]) -> None:
+    def batch_insert(self, table: str, columns: Sequence[str], rows: list[tuple]) -> None:
         """Insert many rows in a single transaction.
 
         Table names are validated against the known schema to prevent injection.
@@ -550,6 +559,27 @@ class Database:
             )
             conn.commit()
 
+    def get_claude_file_state(self) -> dict[str, tuple[float, int]]:
+        """Load every tracked transcript's (mtime, byte offset), keyed by path."""
+        conn = self._ensure_conn()
+        with self._lock:
+            rows = conn.execute("SELECT path, mtime, offset FROM claude_file_state").fetchall()
+        return {path: (mtime, offset) for path, mtime, offset in rows}
+
+    def set_claude_file_state(self, rows: list[tuple[str, float, int]]) -> None:
+        """Upsert (path, mtime, offset) for the transcripts that changed."""
+        if not rows:
+            return
+        conn = self._ensure_conn()
+        with self._lock:
+            with conn:
+                conn.executemany(
+                    """INSERT INTO claude_file_state (path, mtime, offset) VALUES (?, ?, ?)
+                       ON CONFLICT(path) DO UPDATE
+                       SET mtime = excluded.mtime, offset = excluded.offset""",
+                    rows,
+                )
+
     # ── health ──────────────────────────────────────────────────────────
 
     def log_health(self, ts: float, event_type: str, details: str = "") -> None:
@@ -13,8 +13,8 @@ import sys
 import time
 from pathlib import Path
 
-from snoopy.buffer import Event, EventBuffer
-from snoopy.collectors.claude import parse_transcript
+from snoopy.buffer import EventBuffer
+from snoopy.collectors.claude import parse_transcript, transcript_events
 from snoopy.db import Database
 
 
@@ -51,19 +51,7 @@ def _log_transcript() -> int:
 
         parsed, new_offset = parse_transcript(path, since_offset=last_offset)
 
-        for ev in parsed:
-            buf.push(Event(
-                table="claude_events",
-                columns=[
-                    "timestamp", "session_id", "message_type",
-                    "content_preview", "project_path",
-                ],
-                values=(
-                    ev["timestamp"], ev["session_id"],
-                    ev["message_type"], ev["content_preview"],
-                    ev["project_path"],
-                ),
-            ))
+        buf.push_many(transcript_events(parsed))
 
         buf.flush()
         db.set_watermark(watermark_key, str(new_offset), time.time())
@@ -1,11 +1,14 @@
+use std::borrow::Cow;
 use std::collections::HashSet;
 use std::fs::File;
-use std::io::{BufRead, BufReader, Seek, SeekFrom};
+use std::io::{BufRead, BufReader, Seek, SeekFrom, Write};
 use std::sync::OnceLock;
 
 use memchr::memmem;
+use pyo3::intern;
 use pyo3::prelude::*;
-use pyo3::types::{PyDict, PyList, PySet, PyTuple};
+use pyo3::types::{PyDict, PyList, PySet, PyString, PyTuple};
+use regex::bytes::Regex as BytesRegex;
 use regex::Regex;
 
 /// Extract plain text from an NSArchiver attributedBody blob.
@@ -50,8 +53,9 @@ fn extract_attributed_body_text(blob: &[u8]) -> String {
 fn lsof_regex() -> &'static Regex {
     static RE: OnceLock<Regex> = OnceLock::new();
     RE.get_or_init(|| {
+        // Multiline and [ \t] rather than \s, so a match can never straddle two lines
         Regex::new(
-            r"^(\S+)\s+\d+\s+\S+\s+\S+\s+IPv[46]\s+\S+\s+\S+\s+TCP\s+\S+->(\d+\.\d+\.\d+\.\d+):(\d+)\s+\(ESTABLISHED\)"
+            r"(?m)^(\S+)[ \t]+\d+[ \t]+\S+[ \t]+\S+[ \t]+IPv[46][ \t]+\S+[ \t]+\S+[ \t]+TCP[ \t]+\S+->(\d+\.\d+\.\d+\.\d+):(\d+)[ \t]+\(ESTABLISHED\)"
         ).unwrap()
     })
 }
@@ -61,14 +65,15 @@ fn lsof_regex() -> &'static Regex {
 fn parse_lsof_output<'py>(py: Python<'py>, output: &str) -> PyResult<Bound<'py, PySet>> {
     let re = lsof_regex();
 
-    let mut set = HashSet::new();
-    for line in output.lines() {
-        if let Some(caps) = re.captures(line) {
-            let process = caps[1].to_string();
-            let ip = caps[2].to_string();
-            let port: u16 = caps[3].parse().unwrap_or(0);
-            set.insert((process, ip, port));
-        }
+    // One scan over the whole buffer; the set borrows slices of `output`
+    let mut set: HashSet<(&str, &str, u16)> = HashSet::new();
+    for caps in re.captures_iter(output) {
+        let port: u16 = caps[3].parse().unwrap_or(0);
+        set.insert((
+            caps.get(1).unwrap().as_str(),
+            caps.get(2).unwrap().as_str(),
+            port,
+        ));
     }
 
     let pyset = PySet::empty(py)?;
@@ -83,6 +88,36 @@ fn parse_lsof_output<'py>(py: Python<'py>, output: &str) -> PyResult<Bound<'py,
     Ok(pyset)
 }
 
+fn ps_app_regex() -> &'static BytesRegex {
+    static RE: OnceLock<BytesRegex> = OnceLock::new();
+    RE.get_or_init(|| {
+        // /Applications/ is tried against the whole line before /CoreServices/,
+        // so ".../CoreServices/Applications/Foo.app/" resolves to "Foo".
+        BytesRegex::new(r"^(?:.*?/Applications/(.+?)\.app/|.*?/CoreServices/(.+?)\.app/)").unwrap()
+    })
+}
+
+/// Parse raw `ps -eo comm` output into the set of running app names.
+#[pyfunction]
+fn parse_ps_comm_output<'py>(py: Python<'py>, output: &[u8]) -> PyResult<Bound<'py, PySet>> {
+    let re = ps_app_regex();
+
+    let mut names = HashSet::new();
+    for line in output.split(|&b| b == b'\n') {
+        if let Some(caps) = re.captures(line) {
+            if let Some(m) = caps.get(1).or_else(|| caps.get(2)) {
+                names.insert(String::from_utf8_lossy(m.as_bytes()).into_owned());
+            }
+        }
+    }
+
+    let pyset = PySet::empty(py)?;
+    for name in names {
+        pyset.add(name)?;
+    }
+    Ok(pyset)
+}
+
 fn extract_content(msg: &serde_json::Value) -> String {
     let content = &msg["content"];
     if let Some(s) = content.as_str() {
@@ -104,55 +139,84 @@ fn extract_content(msg: &serde_json::Value) -> String {
     String::new()
 }
 
-fn tool_input_preview(tool_name: &str, tool_input: &serde_json::Value) -> String {
-    match tool_name {
-        "Bash" => tool_input
-            .get("command")
-            .and_then(|v| v.as_str())
-            .unwrap_or("")
-            .to_string(),
-        "Read" | "Glob" => tool_input
-            .get("file_path")
-            .or_else(|| tool_input.get("pattern"))
-            .and_then(|v| v.as_str())
-            .unwrap_or("")
-            .to_string(),
-        "Write" => {
-            let path = tool_input
+const TOOL_JSON_PREVIEW: usize = 200;
+
+/// io::Write sink that keeps the first `cap` bytes and then fails, so
+/// serialization stops as soon as the preview is full.
+struct CappedWriter {
+    buf: Vec<u8>,
+    cap: usize,
+}
+
+impl Write for CappedWriter {
+    fn write(&mut self, data: &[u8]) -> std::io::Result<usize> {
+        let room = self.cap - self.buf.len();
+        if data.len() > room {
+            self.buf.extend_from_slice(&data[..room]);
+            return Err(std::io::Error::other("preview full"));
+        }
+        self.buf.extend_from_slice(data);
+        Ok(data.len())
+    }
+
+    fn flush(&mut self) -> std::io::Result<()> {
+        Ok(())
+    }
+}
+
+/// First `cap` bytes of the JSON encoding of `value`, cut at a char boundary.
+fn json_preview(value: &serde_json::Value, cap: usize) -> String {
+    let mut w = CappedWriter { buf: Vec::with_capacity(cap), cap };
+    // An error here only means the cap was hit; the prefix is still valid JSON text
+    let _ = serde_json::to_writer(&mut w, value);
+    match String::from_utf8(w.buf) {
+        Ok(s) => s,
+        Err(e) => {
+            let valid = e.utf8_error().valid_up_to();
+            let mut bytes = e.into_bytes();
+            bytes.truncate(valid);
+            String::from_utf8(bytes).unwrap_or_default()
+        }
+    }
+}
+
+/// Preview of a tool_use input, already cut to `preview_len` bytes.
+fn tool_input_preview(
+    tool_name: &str,
+    tool_input: &serde_json::Value,
+    preview_len: usize,
+) -> String {
+    let field = |key: &str| tool_input.get(key).and_then(|v| v.as_str());
+    let preview: Cow<str> = match tool_name {
+        "Bash" => Cow::Borrowed(field("command").unwrap_or("")),
+        "Read" | "Glob" => Cow::Borrowed(
+            tool_input
                 .get("file_path")
+                .or_else(|| tool_input.get("pattern"))
                 .and_then(|v| v.as_str())
-                .unwrap_or("");
-            let size = tool_input
-                .get("content")
-                .and_then(|v| v.as_str())
-                .map(|s| s.len())
-                .unwrap_or(0);
-            format!("{path} ({size} chars)")
+                .unwrap_or(""),
+        ),
+        "Write" => {
+            let path = field("file_path").unwrap_or("");
+            let size = field("content").map(|s| s.len()).unwrap_or(0);
+            Cow::Owned(format!("{path} ({size} chars)"))
         }
-        "Edit" => tool_input
-            .get("file_path")
-            .and_then(|v| v.as_str())
-            .unwrap_or("")
-            .to_string(),
+        "Edit" => Cow::Borrowed(field("file_path").unwrap_or("")),
         "Grep" => {
-            let pattern = tool_input
-                .get("pattern")
-                .and_then(|v| v.as_str())
-                .unwrap_or("");
-            let path = tool_input
-                .get("path")
-                .and_then(|v| v.as_str())
-                .unwrap_or(".");
-            format!("/{pattern}/ in {path}")
+            let pattern = field("pattern").unwrap_or("");
+            let path = field("path").unwrap_or(".");
+            Cow::Owned(format!("/{pattern}/ in {path}"))
         }
-        "Task" => tool_input
-            .get("description")
-            .and_then(|v| v.as_str())
-            .unwrap_or("")
-            .to_string(),
-        _ => {
-            let s = serde_json::to_string(tool_input).unwrap_or_default();
-            truncate_str(&s, 200).to_string()
+        "Task" => Cow::Borrowed(field("description").unwrap_or("")),
+        // Never serialize more than either limit will keep
+        _ => return json_preview(tool_input, TOOL_JSON_PREVIEW.min(preview_len)),
+    };
+    match preview {
+        Cow::Borrowed(s) => truncate_str(s, preview_len).to_string(),
+        Cow::Owned(mut s) => {
+            let end = truncate_str(&s, preview_len).len();
+            s.truncate(end);
+            s
         }
     }
 }
@@ -215,6 +279,70 @@ fn parse_iso_ts(ts_str: &str) -> Option<f64> {
     Some(epoch_secs as f64 + frac - tz_offset_secs as f64)
 }
 
+/// Epoch second of the most recent "YYYY-MM-DDTHH:MM" prefix seen by
+/// `parse_iso_ts_cached`. Consecutive transcript lines are nearly always
+/// written within the same minute, so most lookups skip the date math.
+#[derive(Default)]
+struct TsCache {
+    minute_prefix: String,
+    minute_epoch: i64,
+}
+
+/// `parse_iso_ts` specialised for "YYYY-MM-DDTHH:MM:SS[.fff][Z|±HH:MM]",
+/// memoising the minute part. Other layouts go through `parse_iso_ts`.
+fn parse_iso_ts_cached(ts_str: &str, cache: &mut TsCache) -> Option<f64> {
+    let b = ts_str.as_bytes();
+    if b.len() < 19
+        || b[4] != b'-'
+        || b[7] != b'-'
+        || b[10] != b'T'
+        || b[13] != b':'
+        || b[16] != b':'
+    {
+        return parse_iso_ts(ts_str);
+    }
+
+    let prefix = &ts_str[..16];
+    if cache.minute_prefix != prefix {
+        let year: i64 = ts_str[0..4].parse().ok()?;
+        let month: i64 = ts_str[5..7].parse().ok()?;
+        let day: i64 = ts_str[8..10].parse().ok()?;
+        let hour: i64 = ts_str[11..13].parse().ok()?;
+        let minute: i64 = ts_str[14..16].parse().ok()?;
+        cache.minute_epoch = days_from_epoch(year, month, day)? * 86400 + hour * 3600 + minute * 60;
+        cache.minute_prefix.clear();
+        cache.minute_prefix.push_str(prefix);
+    }
+
+    let rest = &ts_str[17..];
+    let sec: i64 = rest.get(..2)?.parse().ok()?;
+    let mut tail = &rest[2..];
+    let mut frac = 0.0;
+    if let Some(f) = tail.strip_prefix('.') {
+        let end = f.find(|c: char| !c.is_ascii_digit()).unwrap_or(f.len());
+        let digits = &f[..end];
+        if !digits.is_empty() {
+            frac = digits.parse::<f64>().ok()? / 10f64.powi(digits.len() as i32);
+        }
+        tail = &f[end..];
+    }
+    let tz_offset_secs = match tail.as_bytes().first() {
+        None | Some(b'Z') => 0,
+        Some(&sign @ (b'+' | b'-')) => {
+            let (h, m) = tail[1..].split_once(':').unwrap_or((&tail[1..], "0"));
+            let secs = h.parse::<i64>().ok()? * 3600 + m.parse::<i64>().ok()? * 60;
+            if sign == b'-' {
+                -secs
+            } else {
+                secs
+            }
+        }
+        _ => return parse_iso_ts(ts_str),
+    };
+
+    Some((cache.minute_epoch + sec) as f64 + frac - tz_offset_secs as f64)
+}
+
 fn days_from_epoch(year: i64, month: i64, day: i64) -> Option<i64> {
     let (y, m) = if month <= 2 {
         (year - 1, month + 9)
@@ -241,12 +369,19 @@ fn truncate_str(s: &str, max_len: usize) -> &str {
     }
 }
 
+/// One parsed event. session_id/project_path are per-file, so they are
+/// attached once when the Python dicts are built rather than copied here.
 struct TranscriptEvent {
     timestamp: f64,
-    session_id: String,
     message_type: String,
     content_preview: String,
-    project_path: String,
+}
+
+fn session_and_project(path: &str) -> (&str, &str) {
+    let file_path = std::path::Path::new(path);
+    let session_id = file_path.file_stem().and_then(|s| s.to_str()).unwrap_or("");
+    let project_path = file_path.parent().and_then(|p| p.to_str()).unwrap_or("");
+    (session_id, project_path)
 }
 
 fn parse_transcript_impl(
@@ -254,18 +389,6 @@ fn parse_transcript_impl(
     since_offset: u64,
     preview_len: usize,
 ) -> Result<(Vec<TranscriptEvent>, u64), String> {
-    let file_path = std::path::Path::new(path);
-    let session_id = file_path
-        .file_stem()
-        .and_then(|s| s.to_str())
-        .unwrap_or("")
-        .to_string();
-    let project_path = file_path
-        .parent()
-        .and_then(|p| p.to_str())
-        .unwrap_or("")
-        .to_string();
-
     let file = File::open(path).map_err(|e| e.to_string())?;
     let mut reader = BufReader::new(file);
     reader
@@ -273,21 +396,24 @@ fn parse_transcript_impl(
         .map_err(|e| e.to_string())?;
 
     let mut events = Vec::new();
-    let mut line_buf = String::new();
+    // Raw bytes: serde_json validates UTF-8 and skips trailing whitespace itself,
+    // and a line with invalid UTF-8 is dropped instead of failing the whole read.
+    let mut line_buf: Vec<u8> = Vec::new();
+    let mut ts_cache = TsCache::default();
 
     loop {
         line_buf.clear();
-        let bytes_read = reader.read_line(&mut line_buf).map_err(|e| e.to_string())?;
+        let bytes_read = reader
+            .read_until(b'\n', &mut line_buf)
+            .map_err(|e| e.to_string())?;
         if bytes_read == 0 {
             break;
         }
-
-        let trimmed = line_buf.trim();
-        if trimmed.is_empty() {
+        if bytes_read < 2 {
             continue;
         }
 
-        let entry: serde_json::Value = match serde_json::from_str(trimmed) {
+        let entry: serde_json::Value = match serde_json::from_slice(&line_buf) {
             Ok(v) => v,
             Err(_) => continue,
         };
@@ -301,7 +427,7 @@ fn parse_transcript_impl(
             .and_then(|v| v.as_str())
             .unwrap_or("");
         let ts = if !ts_str.is_empty() {
-            parse_iso_ts(ts_str).unwrap_or(0.0)
+            parse_iso_ts_cached(ts_str, &mut ts_cache).unwrap_or(0.0)
         } else {
             0.0
         };
@@ -321,10 +447,8 @@ fn parse_transcript_impl(
                 }
                 events.push(TranscriptEvent {
                     timestamp: ts,
-                    session_id: session_id.clone(),
                     message_type: "user".to_string(),
                     content_preview: truncate_str(&content, preview_len).to_string(),
-                    project_path: project_path.clone(),
                 });
             }
             "assistant" => {
@@ -348,10 +472,8 @@ fn parse_transcript_impl(
                                 .unwrap_or("");
                             events.push(TranscriptEvent {
                                 timestamp: ts,
-                                session_id: session_id.clone(),
                                 message_type: "assistant_text".to_string(),
                                 content_preview: truncate_str(text, preview_len).to_string(),
-                                project_path: project_path.clone(),
                             });
                         }
                         "tool_use" => {
@@ -363,14 +485,14 @@ fn parse_transcript_impl(
                             let tool_input = block
                                 .get("input")
                                 .unwrap_or(&empty_obj);
-                            let preview = tool_input_preview(tool_name, tool_input);
                             events.push(TranscriptEvent {
                                 timestamp: ts,
-                                session_id: session_id.clone(),
                                 message_type: format!("tool_use:{tool_name}"),
-                                content_preview: truncate_str(&preview, preview_len)
-                                    .to_string(),
-                                project_path: project_path.clone(),
+                                content_preview: tool_input_preview(
+                                    tool_name,
+                                    tool_input,
+                                    preview_len,
+                                ),
                             });
                         }
                         _ => {}
@@ -397,10 +519,8 @@ fn parse_transcript_impl(
                     };
                     events.push(TranscriptEvent {
                         timestamp: ts,
-                        session_id: session_id.clone(),
                         message_type: format!("tool_result:{tool_name}"),
                         content_preview: truncate_str(&output_str, preview_len).to_string(),
-                        project_path: project_path.clone(),
                     });
                 }
             }
@@ -426,16 +546,24 @@ fn parse_transcript<'py>(
     let (events, final_offset) = parse_transcript_impl(path, since_offset, preview_len)
         .map_err(|e| pyo3::exceptions::PyIOError::new_err(e))?;
 
-    let py_list = PyList::empty(py);
-    for ev in &events {
-        let dict = PyDict::new(py);
-        dict.set_item("timestamp", ev.timestamp)?;
-        dict.set_item("session_id", &ev.session_id)?;
-        dict.set_item("message_type", &ev.message_type)?;
-        dict.set_item("content_preview", &ev.content_preview)?;
-        dict.set_item("project_path", &ev.project_path)?;
-        py_list.append(dict)?;
-    }
+    // One Python str each for the per-file fields, shared by every event dict
+    let (session_id, project_path) = session_and_project(path);
+    let session_id = PyString::new(py, session_id);
+    let project_path = PyString::new(py, project_path);
+
+    let dicts = events
+        .iter()
+        .map(|ev| {
+            let dict = PyDict::new(py);
+            dict.set_item(intern!(py, "timestamp"), ev.timestamp)?;
+            dict.set_item(intern!(py, "session_id"), &session_id)?;
+            dict.set_item(intern!(py, "message_type"), &ev.message_type)?;
+            dict.set_item(intern!(py, "content_preview"), &ev.content_preview)?;
+            dict.set_item(intern!(py, "project_path"), &project_path)?;
+            Ok(dict)
+        })
+        .collect::<PyResult<Vec<_>>>()?;
+    let py_list = PyList::new(py, dicts)?;
 
     Ok((py_list, final_offset))
 }
@@ -444,6 +572,7 @@ fn parse_transcript<'py>(
 fn snoopy_native(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(extract_attributed_body_text, m)?)?;
     m.add_function(wrap_pyfunction!(parse_lsof_output, m)?)?;
+    m.add_function(wrap_pyfunction!(parse_ps_comm_output, m)?)?;
     m.add_function(wrap_pyfunction!(parse_transcript, m)?)?;
     Ok(())
 }
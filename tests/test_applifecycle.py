@@ -1,5 +1,6 @@
 """Tests for app lifecycle collector — verifies launch/quit detection."""
 
+import subprocess
 
 import pytest
 
@@ -30,6 +31,41 @@ class TestGetRunningApps:
         # Finder should always be running on macOS
         assert "Finder" in apps
 
+    def test_extracts_names_from_ps_output(self, monkeypatch):
+        """App, system app, nested and CoreServices paths all map to app names."""
+        stdout = b"\n".join([
+            b"COMM",
+            b"/Applications/Safari.app/Contents/MacOS/Safari",
+            b"/System/Applications/Mail.app/Contents/MacOS/Mail",
+            b"/Applications/Utilities/Nudge.app/Contents/MacOS/Nudge",
+            b"/System/Library/CoreServices/Finder.app/Contents/MacOS/Finder",
+            b"/System/Library/CoreServices/Applications/Ticket Viewer.app/Contents/MacOS/X",
+            b"/usr/libexec/logd",
+        ])
+        monkeypatch.setattr("snoopy.collectors.applifecycle._libproc", None)
+        monkeypatch.setattr(
+            "snoopy.collectors.applifecycle.subprocess.run",
+            lambda *a, **kw: subprocess.CompletedProcess(a, 0, stdout=stdout, stderr=b""),
+        )
+
+        assert _get_running_apps() == {
+            "Safari", "Mail", "Utilities/Nudge", "Finder", "Ticket Viewer",
+        }
+
+    def test_prefers_libproc_paths_over_ps(self, monkeypatch):
+        """When libproc paths are available, ps is never spawned."""
+        monkeypatch.setattr(
+            "snoopy.collectors.applifecycle._list_process_paths",
+            lambda: [b"/Applications/Safari.app/Contents/MacOS/Safari", b"/sbin/launchd"],
+        )
+
+        def fail(*a, **kw):
+            raise AssertionError("ps should not run")
+
+        monkeypatch.setattr("snoopy.collectors.applifecycle.subprocess.run", fail)
+
+        assert _get_running_apps() == {"Safari"}
+
 
 class TestAppLifecycleCollector:
     def test_first_run_sets_baseline_no_events(self, buf, db, monkeypatch):
@@ -1,10 +1,16 @@
 """Tests for audio collector — verifies mic/speaker transition detection."""
 
+import time
 
 import pytest
 
 from snoopy.buffer import EventBuffer
-from snoopy.collectors.audio import AudioCollector, _get_default_device, _is_device_running
+from snoopy.collectors.audio import (
+    AudioCollector,
+    _find_audio_process,
+    _get_default_device,
+    _is_device_running,
+)
 from snoopy.db import Database
 
 
@@ -40,6 +46,29 @@ class TestCoreAudioAPI:
             assert isinstance(result, bool)
 
 
+class TestFindAudioProcess:
+    def test_resolves_coreaudio_client_pid(self, monkeypatch):
+        """With CoreAudio's client pid list available, lsof is never run."""
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._audio_client_pids", lambda is_input: [0, 4242],
+        )
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._process_name",
+            lambda pid: "zoom.us" if pid == 4242 else "",
+        )
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._lsof_audio_process",
+            lambda: pytest.fail("lsof should not run"),
+        )
+        assert _find_audio_process(is_input=True) == "zoom.us"
+
+    def test_falls_back_to_lsof_without_process_list(self, monkeypatch):
+        """Older macOS without the process object list still uses lsof."""
+        monkeypatch.setattr("snoopy.collectors.audio._audio_client_pids", lambda is_input: None)
+        monkeypatch.setattr("snoopy.collectors.audio._lsof_audio_process", lambda: "FaceTime")
+        assert _find_audio_process(is_input=False) == "FaceTime"
+
+
 class TestAudioCollector:
     def test_only_logs_on_state_transitions(self, buf, db, monkeypatch):
         """Simulate mic going active → still active → inactive.
@@ -55,7 +84,7 @@ class TestAudioCollector:
         )
         monkeypatch.setattr(
             "snoopy.collectors.audio._find_audio_process",
-            lambda: "zoom.us",
+            lambda is_input: "zoom.us",
         )
 
         c = AudioCollector(buf, db)
@@ -78,7 +107,9 @@ class TestAudioCollector:
         be recorded in the event."""
 
         monkeypatch.setattr("snoopy.collectors.audio._is_device_running", lambda dev_id: True)
-        monkeypatch.setattr("snoopy.collectors.audio._find_audio_process", lambda: "zoom.us")
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._find_audio_process", lambda is_input: "zoom.us",
+        )
 
         c = AudioCollector(buf, db)
         c._input_device = 42
@@ -97,3 +128,80 @@ class TestAudioCollector:
         )
         row = cur.fetchone()
         assert row == ("microphone", 1, "zoom.us")
+
+    def test_listener_notification_triggers_reread(self, buf, db, monkeypatch):
+        """A property-listener callback should wake the drain thread, which logs the
+        transition without any polling interval."""
+        running = {"mic": False}
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._get_default_device",
+            lambda is_input: 42 if is_input else None,
+        )
+        monkeypatch.setattr("snoopy.collectors.audio._add_listener", lambda *a: True)
+        monkeypatch.setattr("snoopy.collectors.audio._remove_listener", lambda *a: None)
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._is_device_running", lambda dev_id: running["mic"],
+        )
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._find_audio_process", lambda is_input: "zoom.us",
+        )
+
+        c = AudioCollector(buf, db)
+        c.start()
+        try:
+            running["mic"] = True
+            c._on_property_changed(42, 1, None, None)
+            deadline = time.time() + 2
+            while not c._last_mic_active and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            c.stop()
+        buf.flush()
+
+        cur = db._ensure_conn().execute(
+            "SELECT device_type, is_active, process_name FROM audio_events"
+        )
+        assert cur.fetchall() == [("microphone", 1, "zoom.us")]
+
+    def test_quick_toggle_within_debounce_is_not_logged(self, buf, db, monkeypatch):
+        """Off → on → off inside the debounce window settles back to off: no events."""
+        running = {"mic": False}
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._get_default_device",
+            lambda is_input: 42 if is_input else None,
+        )
+        monkeypatch.setattr("snoopy.collectors.audio._add_listener", lambda *a: True)
+        monkeypatch.setattr("snoopy.collectors.audio._remove_listener", lambda *a: None)
+        monkeypatch.setattr(
+            "snoopy.collectors.audio._is_device_running", lambda dev_id: running["mic"],
+        )
+        monkeypatch.setattr("snoopy.collectors.audio.AUDIO_DEBOUNCE", 0.2)
+
+        c = AudioCollector(buf, db)
+        c.start()
+        try:
+            time.sleep(0.05)  # initial read
+            running["mic"] = True
+            c._on_property_changed(42, 1, None, None)
+            time.sleep(0.05)
+            running["mic"] = False
+            c._on_property_changed(42, 1, None, None)
+            time.sleep(0.4)
+        finally:
+            c.stop()
+        buf.flush()
+
+        assert db.count("audio_events") == 0
+
+    def test_stop_joins_drain_thread_in_polling_fallback(self, buf, db, monkeypatch):
+        """Without listeners the drain thread polls, but must still exit before stop() returns."""
+        monkeypatch.setattr("snoopy.collectors.audio._get_default_device", lambda is_input: 42)
+        monkeypatch.setattr("snoopy.collectors.audio._add_listener", lambda *a: False)
+        monkeypatch.setattr("snoopy.collectors.audio._remove_listener", lambda *a: None)
+        monkeypatch.setattr("snoopy.collectors.audio._is_device_running", lambda dev_id: False)
+
+        c = AudioCollector(buf, db)
+        c.start()
+        assert not c._listening
+        c.stop()
+        assert not c._thread.is_alive()
@@ -35,6 +35,21 @@ class FailingCollector(BaseCollector):
         raise RuntimeError("intentional test error")
 
 
+class SlowCollector(BaseCollector):
+    """Collector whose first cycle overruns several intervals of a fake clock."""
+    name = "slow"
+    interval = 0.1
+
+    def setup(self) -> None:
+        self.clock = 100.0
+        self.started: list[float] = []
+
+    def collect(self) -> None:
+        self.started.append(self.clock)
+        if len(self.started) == 1:
+            self.clock += 0.35
+
+
 @pytest.fixture
 def db(tmp_path):
     d = Database(path=tmp_path / "test.db")
@@ -68,6 +83,29 @@ class TestBaseCollector:
         assert c.running
         c.stop()
 
+    def test_overrun_skips_missed_ticks(self, buf, db, monkeypatch):
+        """A cycle that overruns 3.5 intervals resumes on the next tick boundary,
+        not with back-to-back catch-up cycles."""
+        c = SlowCollector(buf, db)
+        c.setup()
+        monkeypatch.setattr("snoopy.collectors.base.time.monotonic", lambda: c.clock)
+
+        timeouts = []
+
+        def fake_wait(timeout):
+            timeouts.append(timeout)
+            c.clock += timeout
+            if len(timeouts) == 3:
+                c._stop_event.set()
+            return c._stop_event.is_set()
+
+        monkeypatch.setattr(c._stop_event, "wait", fake_wait)
+        c._run_loop()
+
+        # Overran to 100.35: waits until the 100.4 boundary, then keeps the 0.1 period
+        assert timeouts == pytest.approx([0.05, 0.1, 0.1])
+        assert c.started == pytest.approx([100.0, 100.4, 100.5])
+
     def test_watermark_helpers(self, buf, db):
         """Set and get a watermark through the collector's helper methods."""
         c = DummyCollector(buf, db)
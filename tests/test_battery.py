@@ -1,6 +1,8 @@
 """Tests for battery collector — verifies parsing and deduplication."""
 
+import os
 import subprocess
+import time
 
 import pytest
 
@@ -65,6 +67,28 @@ class TestParsePmset:
 
 
 class TestBatteryCollector:
+    @pytest.fixture(autouse=True)
+    def _use_pmset(self, monkeypatch):
+        """These tests drive the pmset fallback, so hide IOKit."""
+        monkeypatch.setattr("snoopy.collectors.battery._iokit", None)
+
+    def test_prefers_iokit_over_pmset(self, buf, db, monkeypatch):
+        """With IOKit available, pmset is never spawned."""
+        monkeypatch.setattr("snoopy.collectors.battery._iokit", object())
+        monkeypatch.setattr("snoopy.collectors.battery._cf", object())
+        monkeypatch.setattr("snoopy.collectors.battery._read_iokit", lambda: (64, True, "ac"))
+        monkeypatch.setattr(subprocess, "run", lambda *a, **kw: pytest.fail("pmset spawned"))
+
+        c = BatteryCollector(buf, db)
+        c.setup()
+        c.collect()
+        buf.flush()
+
+        cur = db._ensure_conn().execute(
+            "SELECT percent, is_charging, power_source FROM battery_events"
+        )
+        assert cur.fetchone() == (64, 1, "ac")
+
     def _make_fake_run(self, outputs):
         """Return a function that cycles through pmset output strings."""
         idx = [0]
@@ -142,3 +166,76 @@ class TestBatteryCollector:
         buf.flush()
 
         assert db.count("battery_events") == 2
+
+
+class TestNotifySubscription:
+    def test_notification_triggers_reread(self, buf, db, monkeypatch):
+        """A post on the notifyd fd wakes the watch thread, which logs the new state."""
+        r, w = os.pipe()
+        cancelled = []
+        monkeypatch.setattr(
+            "snoopy.collectors.battery._register_notify", lambda name: (r, 7),
+        )
+        monkeypatch.setattr(
+            "snoopy.collectors.battery._cancel_notify",
+            lambda token: cancelled.append(token) or os.close(r),
+        )
+        state = [(100, False, "ac")]
+        monkeypatch.setattr("snoopy.collectors.battery._read_battery", lambda: state[0])
+
+        c = BatteryCollector(buf, db)
+        c.start()
+        try:
+            assert c.interval == 0
+            state[0] = (99, False, "battery")
+            os.write(w, b"\x00\x00\x00\x07")
+            deadline = time.time() + 2
+            while c._last_source != "battery" and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            c.stop()
+            os.close(w)
+        buf.flush()
+
+        assert not c._thread.is_alive()
+        assert cancelled == [7]
+        cur = db._ensure_conn().execute(
+            "SELECT percent, power_source FROM battery_events ORDER BY id"
+        )
+        assert cur.fetchall() == [(100, "ac"), (99, "battery")]
+
+
+class TestAdaptiveInterval:
+    def test_uses_default_interval_until_enough_changes(self, buf, db):
+        """Without history the collector falls back to BATTERY_INTERVAL."""
+        c = BatteryCollector(buf, db)
+        c.setup()
+        assert c.next_interval() == c.interval
+
+    def test_polls_faster_when_changes_are_frequent(self, buf, db, monkeypatch):
+        """Changes every ~2 minutes (charging) shorten the sleep below the default."""
+        now = [1000.0]
+        monkeypatch.setattr("snoopy.collectors.battery.time.monotonic", lambda: now[0])
+
+        c = BatteryCollector(buf, db)
+        c.setup()
+        c._gaps.extend([100.0, 120.0, 140.0, 160.0])
+        c._last_change_at = 1000.0
+        now[0] = 1030.0  # 30s since the last change
+
+        assert c.next_interval() == pytest.approx(90.0)  # lower quartile of 70..130 remaining
+
+    def test_backs_off_past_every_observed_gap(self, buf, db, monkeypatch):
+        """Once longer has passed than any gap seen, poll at the max interval."""
+        import snoopy.config as cfg
+
+        now = [1000.0]
+        monkeypatch.setattr("snoopy.collectors.battery.time.monotonic", lambda: now[0])
+
+        c = BatteryCollector(buf, db)
+        c.setup()
+        c._gaps.extend([60.0, 60.0, 60.0, 60.0])
+        c._last_change_at = 1000.0
+        now[0] = 5000.0
+
+        assert c.next_interval() == cfg.BATTERY_MAX_INTERVAL
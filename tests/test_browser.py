@@ -2,6 +2,7 @@
 
 import sqlite3
 import time
+from pathlib import Path
 
 import pytest
 
@@ -155,6 +156,37 @@ class TestBrowserCollector:
         buf.flush()
         assert db.count("browser_events") == 1
 
+    def test_strips_notification_count_from_titles(self, buf, db, tmp_path, monkeypatch):
+        """"(3) Gmail" is stored as "Gmail"; other parenthesised prefixes are kept."""
+        fake_chrome = tmp_path / "History"
+        _create_fake_chrome_db(fake_chrome)
+
+        monkeypatch.setattr("snoopy.config.CHROME_HISTORY", fake_chrome)
+        monkeypatch.setattr("snoopy.config.ARC_HISTORY", tmp_path / "no_arc")
+        monkeypatch.setattr("snoopy.config.SAFARI_HISTORY", tmp_path / "no_safari")
+        monkeypatch.setattr("snoopy.config.FIREFOX_PROFILES", tmp_path / "no_ff")
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+        c.collect()
+
+        now_chrome = int(time.time() * 1_000_000) + _CHROME_EPOCH_OFFSET
+        titles = ["(3) Gmail", "(12)  Inbox", "(draft) Notes", "(1)x) y", None]
+        conn = sqlite3.connect(str(fake_chrome))
+        for i, title in enumerate(titles, start=3):
+            conn.execute(
+                "INSERT INTO urls VALUES (?, 'https://x.com', ?, 1, 0, ?)",
+                (i, title, now_chrome),
+            )
+            conn.execute("INSERT INTO visits VALUES (?, ?, ?, 0, 0)", (i, i, now_chrome))
+        conn.commit()
+        conn.close()
+
+        c.collect()
+        buf.flush()
+        rows = db._conn.execute("SELECT title FROM browser_events ORDER BY id").fetchall()
+        assert [r[0] for r in rows] == ["Gmail", "Inbox", "(draft) Notes", "(1)x) y", None]
+
     def test_search_terms_first_run_skips_then_collects_new(self, buf, db, tmp_path, monkeypatch):
         """Search terms: first run skips existing, second run collects new."""
         fake_chrome = tmp_path / "History"
@@ -292,3 +324,134 @@ class TestBrowserCollector:
         assert row[1] == "New Site"
         assert row[2] == "Bookmarks bar"
         assert row[3] == "chrome"
+
+    def test_unchanged_bookmarks_not_reparsed(self, buf, db, tmp_path, monkeypatch):
+        """An unchanged Bookmarks file is skipped; a rewritten one is parsed again."""
+        import json
+
+        fake_bookmarks = tmp_path / "Bookmarks"
+        now_chrome = int(time.time() * 1_000_000) + _CHROME_EPOCH_OFFSET
+        _create_fake_bookmarks(fake_bookmarks, now_chrome)
+
+        parses = []
+        real_loads = json.loads
+        monkeypatch.setattr(
+            "snoopy.collectors.browser.json.loads",
+            lambda s: parses.append(1) or real_loads(s),
+        )
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+        c._collect_bookmarks("chrome", fake_bookmarks)
+        c._collect_bookmarks("chrome", fake_bookmarks)
+        assert len(parses) == 1
+
+        data = real_loads(fake_bookmarks.read_text())
+        data["roots"]["bookmark_bar"]["name"] = "Renamed bar"
+        fake_bookmarks.write_text(json.dumps(data))
+        c._collect_bookmarks("chrome", fake_bookmarks)
+        assert len(parses) == 2
+
+    def test_failing_source_does_not_block_others(self, buf, db, tmp_path, monkeypatch):
+        """An exception from one browser is logged; the other sources still run."""
+        fake_chrome = tmp_path / "History"
+        _create_fake_chrome_db(fake_chrome)
+
+        monkeypatch.setattr("snoopy.config.CHROME_HISTORY", fake_chrome)
+        monkeypatch.setattr("snoopy.config.ARC_HISTORY", tmp_path / "no_arc")
+        monkeypatch.setattr("snoopy.config.FIREFOX_PROFILES", tmp_path / "no_ff")
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+
+        def boom():
+            raise RuntimeError("safari exploded")
+
+        monkeypatch.setattr(c, "_collect_safari", boom)
+        c.collect()
+        assert db.get_watermark("browser_chrome") == "2"
+
+    def test_chromium_history_copied_once_per_cycle(self, buf, db, tmp_path, monkeypatch):
+        """Visits, searches and downloads share one copy of the History DB."""
+        fake_chrome = tmp_path / "History"
+        _create_fake_chrome_db(fake_chrome)
+        now_chrome = int(time.time() * 1_000_000) + _CHROME_EPOCH_OFFSET
+        _add_search_terms(fake_chrome, now_chrome)
+        _add_downloads(fake_chrome, now_chrome)
+
+        monkeypatch.setattr("snoopy.config.CHROME_HISTORY", fake_chrome)
+        monkeypatch.setattr("snoopy.config.ARC_HISTORY", tmp_path / "no_arc")
+        monkeypatch.setattr("snoopy.config.SAFARI_HISTORY", tmp_path / "no_safari")
+        monkeypatch.setattr("snoopy.config.FIREFOX_PROFILES", tmp_path / "no_ff")
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+        copies = []
+        real_copy = c._copy_db
+        monkeypatch.setattr(c, "_copy_db", lambda src: copies.append(src) or real_copy(src))
+
+        c.collect()
+        assert copies == [fake_chrome]
+        for key in ("browser_chrome", "browser_chrome_search", "browser_chrome_downloads"):
+            assert db.get_watermark(key) is not None
+
+    def test_copy_db_reuses_snapshot_until_teardown(self, buf, db, tmp_path):
+        """Each source DB is snapshotted through the same connection every cycle."""
+        fake_chrome = tmp_path / "History"
+        _create_fake_chrome_db(fake_chrome)
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+        first = c._copy_db(fake_chrome)
+        assert first.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 2
+
+        conn = sqlite3.connect(str(fake_chrome))
+        conn.execute("INSERT INTO visits VALUES (3, 1, 0, 0, 0)")
+        conn.commit()
+        conn.close()
+
+        second = c._copy_db(fake_chrome)
+        assert second is first
+        assert second.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 3
+
+        tmp = c._snapshots[fake_chrome][0]
+        c.teardown()
+        assert not Path(tmp).exists()
+
+    def test_copy_db_skips_unchanged_source(self, buf, db, tmp_path):
+        """A source DB nobody has written to since its last snapshot isn't copied again."""
+        fake_chrome = tmp_path / "History"
+        _create_fake_chrome_db(fake_chrome)
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+        try:
+            assert c._copy_db(fake_chrome) is not None
+            assert c._copy_db(fake_chrome) is None
+
+            conn = sqlite3.connect(str(fake_chrome))
+            conn.execute("INSERT INTO visits VALUES (3, 1, 0, 0, 0)")
+            conn.commit()
+            conn.close()
+            assert c._copy_db(fake_chrome) is not None
+        finally:
+            c.teardown()
+
+    def test_copy_db_reads_exclusively_locked_db(self, buf, db, tmp_path):
+        """A DB the browser holds an exclusive lock on is still snapshotted."""
+        fake_chrome = tmp_path / "History"
+        _create_fake_chrome_db(fake_chrome)
+        holder = sqlite3.connect(str(fake_chrome))
+        holder.execute("BEGIN EXCLUSIVE")
+
+        c = BrowserCollector(buf, db)
+        c.setup()
+        try:
+            snapshot = c._copy_db(fake_chrome)
+        finally:
+            holder.rollback()
+            holder.close()
+
+        assert snapshot is not None
+        assert snapshot.execute("SELECT COUNT(*) FROM visits").fetchone()[0] == 2
+        c.teardown()
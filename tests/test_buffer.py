@@ -44,6 +44,17 @@ class TestEventBuffer:
         buf.flush()
         assert db.count("idle_events") == 10
 
+    def test_flush_interleaved_tables(self, buf, db):
+        """Events from different tables pushed interleaved land in their own tables."""
+        for i in range(6):
+            if i % 2:
+                buf.push(Event("shell_events", ["timestamp", "command"], (time.time(), f"c{i}")))
+            else:
+                buf.push(Event("wifi_events", ["timestamp", "ssid"], (time.time(), f"n{i}")))
+        buf.flush()
+        assert db.count("shell_events") == 3
+        assert db.count("wifi_events") == 3
+
     def test_auto_flush_on_max_size(self, db):
         """Buffer auto-flushes when BUFFER_MAX_SIZE is exceeded."""
         # Temporarily set a small max
@@ -87,3 +98,34 @@ class TestEventBuffer:
         buf.flush()
         assert not errors
         assert db.count("wifi_events") == 100
+
+    def test_push_not_blocked_during_write(self, buf, db, monkeypatch):
+        """Collectors can push while a flush is still writing to the DB."""
+        writing = threading.Event()
+        release = threading.Event()
+        real_insert = db.batch_insert
+
+        def slow_insert(table, columns, rows):
+            writing.set()
+            release.wait(timeout=5)
+            real_insert(table, columns, rows)
+
+        monkeypatch.setattr(db, "batch_insert", slow_insert)
+        buf.push(Event("shell_events", ["timestamp", "command"], (time.time(), "first")))
+        flusher = threading.Thread(target=buf.flush)
+        flusher.start()
+        assert writing.wait(timeout=5)
+
+        pushed = threading.Event()
+
+        def push_second():
+            buf.push(Event("shell_events", ["timestamp", "command"], (time.time(), "second")))
+            pushed.set()
+
+        threading.Thread(target=push_second).start()
+        assert pushed.wait(timeout=1)
+
+        release.set()
+        flusher.join()
+        buf.flush()
+        assert db.count("shell_events") == 2
@@ -1,10 +1,12 @@
 """Tests for calendar collector — verifies living calendar with change tracking."""
 
+import subprocess
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
 from snoopy.buffer import EventBuffer
+from snoopy.collectors import calendar
 from snoopy.collectors.calendar import CalendarCollector
 from snoopy.db import Database
 
@@ -104,6 +106,20 @@ class TestCalendarCollector:
         ).fetchone()[0]
         assert count == 2
 
+    def test_event_started_before_window_not_re_added(self, buf, db, monkeypatch):
+        """A multi-day event that began before the fetch window is still matched."""
+        now = datetime.now(timezone.utc)
+        ev = dict(_SAMPLE_EVENTS[0], uid="LONG-1",
+                  start=(now - timedelta(days=3)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                  end=(now + timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        c = _make_collector(buf, db, monkeypatch, lambda helper: [ev])
+        c.collect()
+        c.collect()
+
+        conn = db._ensure_conn()
+        count = conn.execute("SELECT COUNT(*) FROM calendar_changes").fetchone()[0]
+        assert count == 1
+
     def test_updates_last_seen(self, buf, db, monkeypatch):
         """Second collect should update last_seen without creating changes."""
         c = _make_collector(buf, db, monkeypatch,
@@ -264,3 +280,27 @@ class TestCalendarCollector:
         assert row[0] is not None
         assert row[1] is not None
         assert row[0] == row[1]  # same on first insert
+
+
+class TestFetchEvents:
+    def test_empty_output_returns_without_waiting(self, tmp_path, monkeypatch):
+        """A helper that writes "[]" (no events) shouldn't hit the timeout."""
+        monkeypatch.setattr(calendar.tempfile, "gettempdir", lambda: str(tmp_path))
+        monkeypatch.setattr(calendar, "_HELPER_TIMEOUT", 1.0)
+
+        def fake_run(args, **kwargs):
+            with open(args[-1], "w") as f:
+                f.write("[]")
+            return subprocess.CompletedProcess(args, 0, "", "")
+
+        monkeypatch.setattr(calendar.subprocess, "run", fake_run)
+        assert calendar._fetch_events("CalendarHelper.app") == []
+
+    def test_times_out_without_output(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(calendar.tempfile, "gettempdir", lambda: str(tmp_path))
+        monkeypatch.setattr(calendar, "_HELPER_TIMEOUT", 0.1)
+        monkeypatch.setattr(
+            calendar.subprocess, "run",
+            lambda args, **kw: subprocess.CompletedProcess(args, 0, "", ""),
+        )
+        assert calendar._fetch_events("CalendarHelper.app") == []
@@ -61,6 +61,38 @@ class TestParseTranscript:
         assert events[2]["content_preview"] == "ls /tmp"
         assert offset > 0
 
+    def test_parses_timestamps_with_offsets(self, tmp_path):
+        """Timestamps in the same minute reuse the cached minute; offsets and
+        fractional seconds must still be applied per entry."""
+
+        transcript = tmp_path / "session-ts.jsonl"
+        _write_transcript(transcript, [
+            {"type": "user", "timestamp": "2026-02-25T10:00:00.250Z",
+             "message": {"content": "a"}},
+            {"type": "user", "timestamp": "2026-02-25T10:00:30+01:00",
+             "message": {"content": "b"}},
+            {"type": "user", "timestamp": "2026-02-25T10:01:00Z", "message": {"content": "c"}},
+        ])
+
+        events, _ = parse_transcript(transcript)
+
+        assert [e["timestamp"] for e in events] == [
+            1772013600.25, 1772013600 + 30 - 3600, 1772013660.0,
+        ]
+
+    def test_skips_blank_and_invalid_utf8_lines(self, tmp_path):
+        """Blank lines and lines with invalid UTF-8 are skipped, not fatal."""
+
+        transcript = tmp_path / "session-bad.jsonl"
+        good = json.dumps({"type": "user", "timestamp": "2026-02-25T10:00:00Z",
+                           "message": {"content": "ok"}}).encode()
+        transcript.write_bytes(b"\n" + b'{"type": "user", "x": "\xff"}\n' + good + b"\n")
+
+        events, offset = parse_transcript(transcript)
+
+        assert [e["content_preview"] for e in events] == ["ok"]
+        assert offset == transcript.stat().st_size
+
     def test_incremental_parsing_with_offset(self, tmp_path):
         """Write 2 entries, parse to get offset. Append 1 more, parse from offset.
         Should only return the new entry."""
@@ -116,3 +148,29 @@ class TestClaudeCollector:
         c.collect()
         buf.flush()
         assert db.count("claude_events") == 1
+
+    def test_truncated_transcript_is_reread_from_start(self, buf, db, tmp_path, monkeypatch):
+        """A transcript that shrinks below the saved offset is read again from offset 0."""
+
+        projects_dir = tmp_path / "projects" / "my-project"
+        projects_dir.mkdir(parents=True)
+        monkeypatch.setattr("snoopy.config.CLAUDE_PROJECTS_DIR", tmp_path / "projects")
+
+        transcript = projects_dir / "session-abc.jsonl"
+        _write_transcript(transcript, [
+            {"type": "user", "timestamp": "2026-02-25T10:00:00Z",
+             "message": {"content": "a much longer first message"}},
+        ])
+
+        c = ClaudeCollector(buf, db)
+        c.setup()
+        c.collect()
+
+        time.sleep(0.05)
+        _write_transcript(transcript, [
+            {"type": "user", "timestamp": "2026-02-25T10:00:01Z", "message": {"content": "new"}},
+        ])
+
+        c.collect()
+        buf.flush()
+        assert db.count("claude_events") == 1
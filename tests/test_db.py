@@ -80,6 +80,19 @@ class TestWatermarks:
         assert db.get_watermark("browser") == "200"
 
 
+class TestClaudeFileState:
+    def test_empty_by_default(self, db):
+        assert db.get_claude_file_state() == {}
+
+    def test_upserts_only_given_paths(self, db):
+        db.set_claude_file_state([("/a.jsonl", 1.0, 10), ("/b.jsonl", 2.0, 20)])
+        db.set_claude_file_state([("/a.jsonl", 3.0, 30)])
+        assert db.get_claude_file_state() == {
+            "/a.jsonl": (3.0, 30),
+            "/b.jsonl": (2.0, 20),
+        }
+
+
 class TestHealth:
     def test_log_health(self, db):
         db.log_health(time.time(), "startup", "daemon started")
@@ -103,7 +116,7 @@ class TestAllTablesExist:
         "shell_events", "wifi_events", "clipboard_events", "file_events",
         "claude_events", "network_events", "location_events",
         "notification_events", "audio_events", "message_events",
-        "collector_state", "daemon_health",
+        "collector_state", "claude_file_state", "daemon_health",
     ]
 
     def test_all_tables_created(self, db):
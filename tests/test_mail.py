@@ -0,0 +1,138 @@
+"""Tests for Apple Mail collector — verifies Envelope Index reads + watermarking."""
+
+import sqlite3
+import time
+
+import pytest
+
+from snoopy.buffer import EventBuffer
+from snoopy.collectors.mail import MailCollector
+from snoopy.db import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    d = Database(path=tmp_path / "test.db")
+    d.open()
+    yield d
+    d.close()
+
+
+@pytest.fixture
+def buf(db):
+    return EventBuffer(db)
+
+
+def _create_envelope_index(path) -> sqlite3.Connection:
+    """Minimal Envelope Index in WAL mode, like Mail's; returns the writer connection."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE messages (
+            ROWID INTEGER PRIMARY KEY, date_received REAL, read INTEGER,
+            deleted INTEGER, flagged INTEGER, mailbox INTEGER,
+            subject INTEGER, sender INTEGER
+        );
+        CREATE TABLE subjects (ROWID INTEGER PRIMARY KEY, subject TEXT);
+        CREATE TABLE addresses (ROWID INTEGER PRIMARY KEY, address TEXT);
+        CREATE TABLE mailboxes (ROWID INTEGER PRIMARY KEY, url TEXT);
+        INSERT INTO mailboxes VALUES (1, 'imap://me@example.com/INBOX');
+        INSERT INTO mailboxes VALUES (2, 'imap://me@example.com/Sent%20Messages');
+        INSERT INTO addresses VALUES (1, 'alice@example.com');
+    """)
+    conn.commit()
+    return conn
+
+
+def _add_message(conn, rowid, subject, mailbox=1, date_received=None):
+    conn.execute("INSERT INTO subjects VALUES (?, ?)", (rowid, subject))
+    conn.execute(
+        "INSERT INTO messages VALUES (?, ?, 0, 0, 0, ?, ?, 1)",
+        (rowid, date_received or time.time(), mailbox, rowid),
+    )
+    conn.commit()
+
+
+def _make_collector(buf, db, tmp_path, monkeypatch):
+    index = tmp_path / "Envelope Index"
+    writer = _create_envelope_index(index)
+    monkeypatch.setattr("snoopy.collectors.mail._find_envelope_index", lambda: index)
+    c = MailCollector(buf, db)
+    c.setup()
+    return c, writer
+
+
+class TestMailCollector:
+    def test_first_run_seeds_recent_then_collects_new(self, buf, db, tmp_path, monkeypatch):
+        c, writer = _make_collector(buf, db, tmp_path, monkeypatch)
+        _add_message(writer, 1, "old", date_received=time.time() - 30 * 86400)
+        _add_message(writer, 2, "recent")
+
+        c.collect()
+        buf.flush()
+        assert db.count("mail_events") == 1
+
+        # Committed to the live index's WAL while Mail (the writer) stays open
+        _add_message(writer, 3, "sent reply", mailbox=2)
+        c.collect()
+        buf.flush()
+
+        rows = db._ensure_conn().execute(
+            "SELECT message_id, mailbox, subject, is_from_me FROM mail_events ORDER BY message_id"
+        ).fetchall()
+        assert rows == [
+            (2, "INBOX", "recent", 0),
+            (3, "Sent Messages", "sent reply", 1),
+        ]
+        assert c.get_watermark() == "3"
+        c.teardown()
+        writer.close()
+
+    def test_index_path_looked_up_once(self, buf, db, tmp_path, monkeypatch):
+        index = tmp_path / "Envelope Index"
+        _create_envelope_index(index).close()
+        lookups = []
+        monkeypatch.setattr(
+            "snoopy.collectors.mail._find_envelope_index",
+            lambda: lookups.append(1) or index,
+        )
+        c = MailCollector(buf, db)
+        c.setup()
+
+        c.collect()
+        c.collect()
+        assert len(lookups) == 1
+
+        # A removed index is noticed on the next poll and looked up again
+        index.unlink()
+        c.collect()
+        assert len(lookups) == 2
+        c.teardown()
+
+    def test_connection_kept_across_polls(self, buf, db, tmp_path, monkeypatch):
+        c, writer = _make_collector(buf, db, tmp_path, monkeypatch)
+        c.collect()
+        conn = c._conn
+        assert conn is not None
+
+        _add_message(writer, 1, "hello")
+        c.collect()
+        buf.flush()
+        assert c._conn is conn
+        assert db.count("mail_events") == 1
+
+        c.teardown()
+        assert c._conn is None
+        writer.close()
+
+    def test_unreadable_index_warns_once(self, buf, db, tmp_path, monkeypatch, caplog):
+        missing = tmp_path / "nope" / "Envelope Index"
+        monkeypatch.setattr("snoopy.collectors.mail._find_envelope_index", lambda: missing)
+        c = MailCollector(buf, db)
+        c.setup()
+
+        c.collect()
+        c.collect()
+
+        assert db.count("mail_events") == 0
+        assert caplog.text.count("Full Disk Access") == 1